@@ -10,6 +10,7 @@ from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from datetime import datetime
+import asyncio
 import hashlib
 import logging
 
@@ -18,6 +19,19 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Tool output beyond this size is cut before it is sent for reflection
+MAX_REFLECTION_CHARS = getattr(settings, "max_reflection_chars", 8000)
+
+# Enrichment fields agents may return alongside their findings
+ENRICHMENT_UPDATE_FIELDS = (
+    "aaa_order_id",
+    "enrichment_flow",
+    "actual_order_id",
+    "comparison_aaa_order_id",
+    "comparison_enrichment_flow",
+    "comparison_actual_order_id"
+)
+
 # Simple in-memory cache (replace with Redis in production)
 class SimpleCache:
     def __init__(self):
@@ -61,6 +75,8 @@ class BaseAgent(ABC):
         """
         self.name = name
         self.system_prompt = system_prompt
+        # System prompt is fixed per agent - build its message once
+        self.system_message = SystemMessage(content=system_prompt)
         
         # Select model based on cost optimization
         model = settings.cheap_model if use_cheap_model else settings.agent_model
@@ -213,9 +229,9 @@ class BaseAgent(ABC):
         # Respect configuration
         return settings.enable_reflection
     
-    def _reflect(self, findings: Dict, context: Dict, state: Dict) -> str:
+    def _reflection_messages(self, findings: Dict, context: Dict, state: Dict) -> list:
         """
-        LLM-based reflection on findings
+        Build the reflection prompt messages
         
         Args:
             findings: Tool execution results
@@ -223,11 +239,15 @@ class BaseAgent(ABC):
             state: Agent state
             
         Returns:
-            Reflection summary
+            System and human messages for the reflection call
         """
+        tool_output = str(findings.get('raw_data', findings))
+        if len(tool_output) > MAX_REFLECTION_CHARS:
+            tool_output = tool_output[:MAX_REFLECTION_CHARS] + "\n...[truncated]"
+        
         reflection_prompt = f"""
 <Show Your Thinking>
-Tool Output: {findings.get('raw_data', findings)}
+Tool Output: {tool_output}
 
 User Query: {state.get('user_query', '')}
 Context: {context.get('prefix', '')}
@@ -242,12 +262,29 @@ Analysis:
 Provide a concise, actionable summary (3-5 sentences max).
 """
         
-        messages = [
-            SystemMessage(content=self.system_prompt),
+        return [
+            self.system_message,
             HumanMessage(content=reflection_prompt)
         ]
+    
+    def _reflect(self, findings: Dict, context: Dict, state: Dict) -> str:
+        """
+        LLM-based reflection on findings
         
-        response = self.llm.invoke(messages)
+        Args:
+            findings: Tool execution results
+            context: Investigation context
+            state: Agent state
+            
+        Returns:
+            Reflection summary
+        """
+        response = self.llm.invoke(self._reflection_messages(findings, context, state))
+        return response.content
+    
+    async def _areflect(self, findings: Dict, context: Dict, state: Dict) -> str:
+        """Async version of _reflect"""
+        response = await self.llm.ainvoke(self._reflection_messages(findings, context, state))
         return response.content
     
     def _simple_summary(self, findings: Dict) -> str:
@@ -276,6 +313,136 @@ Provide a concise, actionable summary (3-5 sentences max).
         """
         pass
     
+    async def _aexecute_tool(self, context: Dict, state: Dict) -> Dict:
+        """
+        Async version of _execute_tool
+        
+        Defaults to running _execute_tool in a worker thread - agents with
+        native async I/O override this.
+        
+        Args:
+            context: Investigation context
+            state: Agent state
+            
+        Returns:
+            Dict with tool results
+        """
+        return await asyncio.to_thread(self._execute_tool, context, state)
+    
+    def _execution_context(self, state: Dict) -> tuple[Dict[str, Any], str, Optional[str]]:
+        """
+        Resolve investigation context, display prefix and cache key
+        
+        Args:
+            state: Current agent state
+            
+        Returns:
+            Tuple of (context, prefix, cache_key) - cache_key is None when caching is off
+        """
+        context = self._get_investigation_context(state)
+        prefix = context["prefix"]
+        
+        # Add enrichment indicator to prefix if order was enriched
+        if context.get("enriched"):
+            prefix += " 🔧"
+        
+        cache_key = None
+        if settings.enable_caching:
+            cache_key = self._get_cache_key(
+                context["order_id"],
+                context.get("date", "")
+            )
+        
+        return context, prefix, cache_key
+    
+    def _cached_findings(self, cache_key: Optional[str]) -> Optional[Dict]:
+        """Get cached tool results, or None on a miss or when caching is off"""
+        if cache_key is None:
+            return None
+        
+        cached = CACHE.get(cache_key, settings.cache_ttl_minutes)
+        if cached:
+            logger.info(f"{self.name}: Using cached result")
+        return cached
+    
+    def _execution_updates(self, state: Dict, findings: Dict, analysis: str, context: Dict, prefix: str) -> Dict:
+        """
+        Store findings and build the state updates for a successful run
+        
+        Args:
+            state: Current agent state
+            findings: Tool execution results
+            analysis: Reflection or simple summary
+            context: Investigation context
+            prefix: Display prefix
+            
+        Returns:
+            Dict with only the fields that need updating
+        """
+        # Store findings efficiently
+        findings["analysis"] = analysis
+        self._store_findings(state, findings, context)
+        
+        # Create AI message
+        ai_message = AIMessage(
+            content=f"**[{self.name}] {prefix}**\n\n{analysis}",
+            name=self.name
+        )
+        
+        logger.info(f"{self.name}: Execution successful")
+        
+        # IMPORTANT: Only return updates, never return user_query
+        # Pass through any enrichment fields from findings
+        updates = {
+            "messages": [ai_message],
+            "sender": self.name,
+            "investigation_step": state.get("investigation_step", 0) + 1  # Increment step
+        }
+        
+        # Pass through enrichment state updates if present
+        for key in ENRICHMENT_UPDATE_FIELDS:
+            if key in findings:
+                updates[key] = findings[key]
+        
+        # Flatten the primary order's Splunk outcome for the routers
+        if "logs_found" in findings and context["findings_key"] == "findings":
+            updates["splunk_logs_found"] = bool(findings["logs_found"])
+        
+        return updates
+    
+    def _error_updates(self, state: Dict, error: Exception, context: Dict, prefix: str) -> Dict:
+        """
+        Record a failed run and build its state updates
+        
+        Args:
+            state: Current agent state
+            error: Exception raised by the run
+            context: Investigation context
+            prefix: Display prefix
+            
+        Returns:
+            Dict with only the fields that need updating
+        """
+        logger.error(f"{self.name} failed: {str(error)}", exc_info=True)
+        
+        error_msg = f"⚠️ {self.name} encountered an error: {str(error)}"
+        
+        # Create error message
+        error_ai_message = AIMessage(
+            content=f"**[{self.name}] {prefix}**\n\n{error_msg}",
+            name=self.name
+        )
+        
+        # Store error in findings (modifies state directly)
+        self._store_findings(state, {"error": str(error)}, context)
+        
+        # IMPORTANT: Only return updates, never return user_query
+        return {
+            "messages": [error_ai_message],
+            "sender": self.name,
+            "error_log": [f"{self.name}: {str(error)}"]  # Will be appended
+        }
+    
     @retry(
         stop=stop_after_attempt(settings.max_retries),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -294,30 +461,16 @@ Provide a concise, actionable summary (3-5 sentences max).
         Returns:
             Dict with only the fields that need updating
         """
-        context = self._get_investigation_context(state)
-        prefix = context["prefix"]
-        
-        # Add enrichment indicator to prefix if order was enriched
-        if context.get("enriched"):
-            prefix += " 🔧"
+        context, prefix, cache_key = self._execution_context(state)
         
         try:
             # Check cache first
-            if settings.enable_caching:
-                cache_key = self._get_cache_key(
-                    context["order_id"],
-                    context.get("date", "")
-                )
-                cached = CACHE.get(cache_key, settings.cache_ttl_minutes)
-                
-                if cached:
-                    logger.info(f"{self.name}: Using cached result")
-                    findings = cached
-                else:
-                    findings = self._execute_tool(context, state)
-                    CACHE.set(cache_key, findings)
-            else:
+            findings = self._cached_findings(cache_key)
+            if not findings:
                 findings = self._execute_tool(context, state)
+                # Failed lookups (e.g. database unavailable) are retried next time
+                if cache_key is not None and "error" not in findings:
+                    CACHE.set(cache_key, findings)
             
             # Reflection (conditional based on need and config)
             if self._needs_reflection(str(findings)):
@@ -325,59 +478,44 @@ Provide a concise, actionable summary (3-5 sentences max).
             else:
                 analysis = self._simple_summary(findings)
             
-            # Store findings efficiently
-            findings["analysis"] = analysis
-            self._store_findings(state, findings, context)
-            
-            # Create AI message
-            ai_message = AIMessage(
-                content=f"**[{self.name}] {prefix}**\n\n{analysis}",
-                name=self.name
-            )
-            
-            logger.info(f"{self.name}: Execution successful")
-            
-            # IMPORTANT: Only return updates, never return user_query
-            # Pass through any enrichment fields from findings
-            updates = {
-                "messages": [ai_message],
-                "sender": self.name,
-                "investigation_step": state.get("investigation_step", 0) + 1  # Increment step
-            }
-            
-            # Pass through enrichment state updates if present
-            if "aaa_order_id" in findings:
-                updates["aaa_order_id"] = findings["aaa_order_id"]
-            if "enrichment_flow" in findings:
-                updates["enrichment_flow"] = findings["enrichment_flow"]
-            if "actual_order_id" in findings:
-                updates["actual_order_id"] = findings["actual_order_id"]
-            if "comparison_aaa_order_id" in findings:
-                updates["comparison_aaa_order_id"] = findings["comparison_aaa_order_id"]
-            if "comparison_enrichment_flow" in findings:
-                updates["comparison_enrichment_flow"] = findings["comparison_enrichment_flow"]
-            if "comparison_actual_order_id" in findings:
-                updates["comparison_actual_order_id"] = findings["comparison_actual_order_id"]
-            
-            return updates
+            return self._execution_updates(state, findings, analysis, context, prefix)
             
         except Exception as e:
-            logger.error(f"{self.name} failed: {str(e)}", exc_info=True)
+            return self._error_updates(state, e, context, prefix)
+    
+    @retry(
+        stop=stop_after_attempt(settings.max_retries),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((ConnectionError, TimeoutError))
+    )
+    async def aexecute(self, state: Dict) -> Dict:
+        """
+        Async version of execute - awaits the tool and the reflection LLM call
+        
+        Args:
+            state: Current agent state
             
-            error_msg = f"⚠️ {self.name} encountered an error: {str(e)}"
+        Returns:
+            Dict with only the fields that need updating
+        """
+        context, prefix, cache_key = self._execution_context(state)
+        
+        try:
+            # Check cache first
+            findings = self._cached_findings(cache_key)
+            if not findings:
+                findings = await self._aexecute_tool(context, state)
+                # Failed lookups (e.g. database unavailable) are retried next time
+                if cache_key is not None and "error" not in findings:
+                    CACHE.set(cache_key, findings)
             
-            # Create error message
-            error_ai_message = AIMessage(
-                content=f"**[{self.name}] {prefix}**\n\n{error_msg}",
-                name=self.name
-            )
+            # Reflection (conditional based on need and config)
+            if self._needs_reflection(str(findings)):
+                analysis = await self._areflect(findings, context, state)
+            else:
+                analysis = self._simple_summary(findings)
             
-            # Store error in findings (modifies state directly)
-            self._store_findings(state, {"error": str(e)}, context)
+            return self._execution_updates(state, findings, analysis, context, prefix)
             
-            # IMPORTANT: Only return updates, never return user_query
-            return {
-                "messages": [error_ai_message],
-                "sender": self.name,
-                "error_log": [f"{self.name}: {str(e)}"]  # Will be appended
-            }
+        except Exception as e:
+            return self._error_updates(state, e, context, prefix)
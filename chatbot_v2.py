@@ -332,10 +332,15 @@ CRITICAL RULES:
         # Update parameters with extracted entities
         if state.get("parameters"):
             params = state["parameters"]
-            for key, value in extracted_entities.items():
-                if hasattr(params, key) and value:
-                    setattr(params, key, value)
-            params.intent = intent
+            updates = {
+                key: value for key, value in extracted_entities.items()
+                if key in QueryParameters.model_fields and value
+            }
+            updates["intent"] = intent
+            # Parameters are frozen - re-validate so dates get normalized
+            state["parameters"] = QueryParameters.model_validate(
+                {**params.model_dump(), **updates}
+            )
         
         try:
             result = self.agent.invoke(state)
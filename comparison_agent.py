@@ -7,7 +7,8 @@ Uses LLM with structured output for comprehensive analysis
 from src.agents.base_agent import BaseAgent
 from typing import Dict, Any, List
 from pydantic import BaseModel, Field
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
+from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,6 +48,25 @@ class ComparisonSummary(BaseModel):
     root_causes: List[RootCause] = Field(description="Identified root causes ranked by importance")
     overall_assessment: str = Field(description="Final assessment with key takeaways")
     anomalies_detected: List[str] = Field(default_factory=list, description="Any unusual patterns or anomalies")
+    
+    def to_fast(self) -> "ComparisonSummaryFast":
+        """Convert to the slotted internal view used for counting"""
+        return ComparisonSummaryFast(
+            root_causes_count=len(self.root_causes),
+            significances=tuple(diff.significance for diff in self.pricing_differences)
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ComparisonSummaryFast:
+    """Internal view of a ComparisonSummary for counting paths (LLM contract stays pydantic)"""
+    root_causes_count: int
+    significances: tuple[str, ...]
+    
+    @property
+    def critical_differences(self) -> int:
+        """Number of pricing differences flagged as Critical"""
+        return self.significances.count("Critical")
 
 
 class ComparisonAgent(BaseAgent):
@@ -123,7 +143,7 @@ Provide a thorough, structured analysis that clearly explains WHY the orders dif
             logger.info(f"{self.name}: Generating structured comparison analysis...")
             
             messages = [
-                SystemMessage(content=self.system_prompt),
+                self.system_message,
                 HumanMessage(content=analysis_prompt)
             ]
             
@@ -132,17 +152,17 @@ Provide a thorough, structured analysis that clearly explains WHY the orders dif
             # Format the structured output into readable summary
             summary = self._format_structured_summary(structured_result)
             
-            # Store both structured and formatted data
+            # Store both structured and formatted data (dump once, share it)
+            structured_data = structured_result.model_dump()
+            fast = structured_result.to_fast()
+            
             return {
-                "raw_data": structured_result.model_dump(),
-                "structured_comparison": structured_result.model_dump(),
+                "raw_data": structured_data,
+                "structured_comparison": structured_data,
                 "summary": summary,
                 "comparison_completed": True,
-                "root_causes_count": len(structured_result.root_causes),
-                "critical_differences": sum(
-                    1 for diff in structured_result.pricing_differences 
-                    if diff.significance == "Critical"
-                )
+                "root_causes_count": fast.root_causes_count,
+                "critical_differences": fast.critical_differences
             }
             
         except Exception as e:
@@ -2,9 +2,77 @@
 Date Handler Utility - Converts various date formats to yyyy-mm-dd
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 import re
+import time
+
+_ONE_DAY = timedelta(days=1)
+
+# Formatted current date and the timestamp (next local midnight) it is valid until
+_current_date_cache = ("", 0.0)
+
+# Absolute date formats, tried in order
+_DATE_FORMATS = [
+    "%Y-%m-%d",      # 2025-10-12
+    "%Y/%m/%d",      # 2025/10/12
+    "%d-%m-%Y",      # 12-10-2025
+    "%d/%m/%Y",      # 12/10/2025
+    "%m/%d/%Y",      # 10/12/2025
+    "%Y%m%d",        # 20251012
+    "%d-%b-%Y",      # 12-Oct-2025
+    "%d %b %Y",      # 12 Oct 2025
+    "%B %d, %Y",     # October 12, 2025
+    "%d %B %Y",      # 12 October 2025
+]
+
+_YMD_RE = re.compile(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})')
+_DMY_RE = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})')
+
+
+@lru_cache(maxsize=4096)
+def _parse_absolute_date(date_str: str) -> Optional[str]:
+    """
+    Parse an absolute (non-relative) date string to yyyy-mm-dd
+    
+    Pure function of its input, so results are cached - dates repeat
+    heavily across queries.
+    
+    Args:
+        date_str: Stripped, lower-cased date string
+        
+    Returns:
+        Date in yyyy-mm-dd format, or None if it could not be parsed
+    """
+    for date_format in _DATE_FORMATS:
+        try:
+            parsed_date = datetime.strptime(date_str, date_format)
+            return parsed_date.strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    
+    # Try to extract date with regex (yyyy-mm-dd pattern)
+    match = _YMD_RE.search(date_str)
+    if match:
+        year, month, day = match.groups()
+        try:
+            parsed_date = datetime(int(year), int(month), int(day))
+            return parsed_date.strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    
+    # Try dd-mm-yyyy or dd/mm/yyyy pattern
+    match = _DMY_RE.search(date_str)
+    if match:
+        day, month, year = match.groups()
+        try:
+            parsed_date = datetime(int(year), int(month), int(day))
+            return parsed_date.strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    
+    return None
 
 
 class DateHandler:
@@ -18,7 +86,16 @@ class DateHandler:
         Returns:
             Current date as string (e.g., "2025-10-12")
         """
-        return datetime.now().strftime("%Y-%m-%d")
+        global _current_date_cache
+        
+        current_date, valid_until = _current_date_cache
+        if time.time() >= valid_until:
+            now = datetime.now()
+            next_midnight = (now + _ONE_DAY).replace(hour=0, minute=0, second=0, microsecond=0)
+            current_date = now.strftime("%Y-%m-%d")
+            _current_date_cache = (current_date, next_midnight.timestamp())
+        
+        return current_date
     
     @staticmethod
     def normalize_date(date_input: Optional[str]) -> str:
@@ -51,56 +128,19 @@ class DateHandler:
             return DateHandler.get_current_date()
         
         if date_str == "yesterday":
-            from datetime import timedelta
-            yesterday = datetime.now() - timedelta(days=1)
+            yesterday = datetime.now() - _ONE_DAY
             return yesterday.strftime("%Y-%m-%d")
         
-        # Try to parse various date formats
-        formats_to_try = [
-            "%Y-%m-%d",      # 2025-10-12
-            "%Y/%m/%d",      # 2025/10/12
-            "%d-%m-%Y",      # 12-10-2025
-            "%d/%m/%Y",      # 12/10/2025
-            "%m/%d/%Y",      # 10/12/2025
-            "%Y%m%d",        # 20251012
-            "%d-%b-%Y",      # 12-Oct-2025
-            "%d %b %Y",      # 12 Oct 2025
-            "%B %d, %Y",     # October 12, 2025
-            "%d %B %Y",      # 12 October 2025
-        ]
-        
-        for date_format in formats_to_try:
-            try:
-                parsed_date = datetime.strptime(date_str, date_format)
-                return parsed_date.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-        
-        # Try to extract date with regex (yyyy-mm-dd pattern)
-        match = re.search(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})', date_str)
-        if match:
-            year, month, day = match.groups()
-            try:
-                parsed_date = datetime(int(year), int(month), int(day))
-                return parsed_date.strftime("%Y-%m-%d")
-            except ValueError:
-                pass
-        
-        # Try dd-mm-yyyy or dd/mm/yyyy pattern
-        match = re.search(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})', date_str)
-        if match:
-            day, month, year = match.groups()
-            try:
-                parsed_date = datetime(int(year), int(month), int(day))
-                return parsed_date.strftime("%Y-%m-%d")
-            except ValueError:
-                pass
+        normalized = _parse_absolute_date(date_str)
+        if normalized:
+            return normalized
         
         # If all parsing fails, return current date as fallback
         print(f"Warning: Could not parse date '{date_input}', using current date")
         return DateHandler.get_current_date()
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def validate_date(date_str: str) -> bool:
         """
         Validate if string is in yyyy-mm-dd format
@@ -4,62 +4,343 @@ Handles: SQL queries, configuration lookup, trade data retrieval, order enrichme
 """
 
 from src.agents.base_agent import BaseAgent
-from langchain_core.tools import tool
-from typing import Dict, Any
+from typing import Dict, Any, Callable, List, Optional
+from collections import OrderedDict
+from config import settings
+import asyncio
+import functools
+import logging
+import threading
+import time
+import weakref
 
+try:
+    import oracledb
+except ImportError:  # Driver not installed - fall back to simulated data
+    oracledb = None
 
-class DatabaseAgent(BaseAgent):
-    """Oracle Database & Configuration Expert"""
+logger = logging.getLogger(__name__)
+
+# Bound statements - Oracle caches the execution plan by statement text,
+# so order IDs are always passed as bind variables, never interpolated
+LOOKUP_ACTUAL_ORDER_ID_SQL = (
+    "SELECT actual_order_id FROM order_mappings WHERE aaa_order_id = :aaa_order_id"
+)
+
+ORDER_DETAILS_SQL = """SELECT o.order_id, o.client_id, c.tier, o.instrument,
+       o.quantity, o.status, p.base_price, p.spread
+FROM orders o
+JOIN clients c ON o.client_id = c.client_id
+JOIN pricing p ON o.instrument = p.instrument
+WHERE o.order_id = :order_id"""
+
+# Order lookups are memoized so repeat investigations skip the round-trip.
+# Order mappings never change; trade details expire after the cache TTL.
+DB_CACHE_SIZE = getattr(settings, "db_cache_size", 1024)
+DB_CACHE_TTL_SECONDS = getattr(settings, "db_cache_ttl_seconds", 60)
+
+# Seconds to wait before trying to create a pool again after a failure
+POOL_RETRY_SECONDS = getattr(settings, "oracle_pool_retry_seconds", 30)
+
+# Successful AAA -> actual order ID lookups (LRU, shared by sync and async paths)
+_order_mapping_cache: "OrderedDict[str, Dict[str, Optional[str]]]" = OrderedDict()
+
+# Trade details fetched on the async path by (order_id, TTL window) (LRU) -
+# the sync path memoizes the same way with _query_order_details_cached
+_aorder_details_cache: "OrderedDict[tuple[str, int], str]" = OrderedDict()
+
+# Shared connection pool (None = not created yet) and async pools by event loop
+_pool = None
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_pool_lock = threading.Lock()
+
+# Last pool creation failure by pool kind: (error, monotonic time of next attempt)
+_pool_failures: Dict[str, tuple[Exception, float]] = {}
+
+
+class DatabaseUnavailableError(Exception):
+    """Oracle connection pool could not be created"""
+    pass
+
+
+def _use_simulated_data() -> bool:
+    """
+    Simulated data is used unless Oracle is configured
     
-    def __init__(self):
-        super().__init__(
-            name="Database_Agent",
-            system_prompt="""You are the **Database Expert** specializing in:
-- Oracle SQL queries and optimization
-- Trade data retrieval
-- Configuration lookup (pricing rules, client tiers)
-- Data integrity validation
-- Order ID enrichment and lookup
+    Oracle needs the driver and settings.oracle_dsn; settings.use_simulated_db
+    forces simulated data even then (development).
+    """
+    return (
+        oracledb is None
+        or not getattr(settings, "oracle_dsn", None)
+        or getattr(settings, "use_simulated_db", False)
+    )
 
-Provide precise SQL queries and interpret database results accurately."""
-        )
+
+def _create_pool(kind: str, create: Callable[[], Any]) -> Any:
+    """
+    Create a connection pool, backing off after a failed attempt
     
-    @tool
-    def lookup_actual_order_id(self, aaa_order_id: str) -> Dict[str, str]:
-        """
-        Lookup actual order ID using AAA order ID (D-prefixed)
+    Args:
+        kind: Pool kind ("sync" or "async") - failures are tracked per kind
+        create: Creates the pool
         
-        Args:
-            aaa_order_id: D-prefixed order ID (e.g., D12345678)
-            
-        Returns:
-            Dict with actual_order_id and lookup status
-        """
-        # TODO: Replace with actual Oracle connection
-        # Example query: SELECT actual_order_id FROM order_mappings WHERE aaa_order_id = ?
+    Returns:
+        Connection pool
         
-        # Simulated lookup - remove D prefix and add ORD prefix
-        actual_order_id = f"ORD{aaa_order_id[1:]}"  # D12345678 -> ORD12345678
+    Raises:
+        DatabaseUnavailableError: Pool creation failed now or within the
+            last POOL_RETRY_SECONDS
+    """
+    failure = _pool_failures.get(kind)
+    if failure and time.monotonic() < failure[1]:
+        raise DatabaseUnavailableError(f"Oracle connection pool unavailable: {failure[0]}")
+    
+    try:
+        pool = create()
+    except oracledb.Error as e:
+        logger.error(f"Oracle {kind} pool creation failed, retrying in {POOL_RETRY_SECONDS}s: {e}")
+        _pool_failures[kind] = (e, time.monotonic() + POOL_RETRY_SECONDS)
+        raise DatabaseUnavailableError(f"Oracle connection pool unavailable: {e}") from e
+    
+    _pool_failures.pop(kind, None)
+    return pool
+
+
+def _get_pool():
+    """
+    Get the shared Oracle connection pool, creating it on first use
+    
+    Returns:
+        Connection pool, or None when simulated data is used
         
+    Raises:
+        DatabaseUnavailableError: The pool could not be created
+    """
+    global _pool
+    
+    if _use_simulated_data():
+        return None
+    
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _create_pool("sync", lambda: oracledb.create_pool(
+                    user=getattr(settings, "oracle_username", None),
+                    password=getattr(settings, "oracle_password", None),
+                    dsn=settings.oracle_dsn,
+                    min=2,
+                    max=getattr(settings, "oracle_connection_pool_size", 10),
+                    increment=1
+                ))
+    
+    return _pool
+
+
+def _get_async_pool():
+    """
+    Get the asyncio Oracle connection pool for the running event loop
+    
+    Async pools are bound to the loop that created them, so each loop gets
+    its own (e.g. repeated asyncio.run calls in CLI batches). Pools are
+    dropped together with their loop.
+    
+    Returns:
+        Async connection pool, or None when simulated data is used or the
+        driver has no asyncio support (callers use the sync pool instead)
+        
+    Raises:
+        DatabaseUnavailableError: The pool could not be created
+    """
+    if _use_simulated_data() or not hasattr(oracledb, "create_pool_async"):
+        return None
+    
+    # Only created from the loop's own thread - no lock needed
+    loop = asyncio.get_running_loop()
+    pool = _async_pools.get(loop)
+    if pool is None:
+        pool = _async_pools[loop] = _create_pool("async", lambda: oracledb.create_pool_async(
+            user=getattr(settings, "oracle_username", None),
+            password=getattr(settings, "oracle_password", None),
+            dsn=settings.oracle_dsn,
+            min=getattr(settings, "oracle_async_pool_min", 4),
+            max=getattr(settings, "oracle_async_pool_max", 32),
+            increment=2
+        ))
+    
+    return pool
+
+
+def _fetch_actual_order_id(aaa_order_id: str) -> Dict[str, Optional[str]]:
+    """Resolve a D-prefixed AAA order ID to the actual order ID"""
+    pool = _get_pool()
+    
+    if pool is None:
+        # Simulated lookup - remove D prefix and add ORD prefix
         return {
-            "actual_order_id": actual_order_id,
+            "actual_order_id": f"ORD{aaa_order_id[1:]}",  # D12345678 -> ORD12345678
             "aaa_order_id": aaa_order_id,
             "lookup_status": "success"
         }
     
-    @tool
-    def query_database(self, order_id: str) -> str:
-        """
-        Query Oracle database for order details.
-        
-        Args:
-            order_id: Order identifier
-            
-        Returns:
-            Database query results with trade details
-        """
-        # TODO: Replace with actual Oracle connection
-        return f"""**Database Query Results**
+    with pool.acquire() as conn:
+        with conn.cursor() as cur:
+            cur.execute(LOOKUP_ACTUAL_ORDER_ID_SQL, aaa_order_id=aaa_order_id)
+            row = cur.fetchone()
+    
+    return _mapping_result(aaa_order_id, row)
+
+
+async def _afetch_actual_order_id(aaa_order_id: str) -> Dict[str, Optional[str]]:
+    """Resolve an AAA order ID without blocking the event loop"""
+    pool = _get_async_pool()
+    
+    if pool is None:
+        return await asyncio.to_thread(_fetch_actual_order_id, aaa_order_id)
+    
+    async with pool.acquire() as conn:
+        with conn.cursor() as cur:
+            await cur.execute(LOOKUP_ACTUAL_ORDER_ID_SQL, aaa_order_id=aaa_order_id)
+            row = await cur.fetchone()
+    
+    return _mapping_result(aaa_order_id, row)
+
+
+def _mapping_result(aaa_order_id: str, row: Optional[tuple]) -> Dict[str, Optional[str]]:
+    """Build the lookup result for an order_mappings row"""
+    return {
+        "actual_order_id": row[0] if row else None,
+        "aaa_order_id": aaa_order_id,
+        "lookup_status": "success" if row else "not_found"
+    }
+
+
+def _cache_order_mapping(result: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """Remember a successful lookup (LRU) - returns a copy callers may mutate"""
+    if result["actual_order_id"]:
+        _order_mapping_cache[result["aaa_order_id"]] = result
+        _order_mapping_cache.move_to_end(result["aaa_order_id"])
+        while len(_order_mapping_cache) > DB_CACHE_SIZE:
+            _order_mapping_cache.popitem(last=False)
+    return dict(result)
+
+
+def _cached_order_mapping(aaa_order_id: str) -> Optional[Dict[str, Optional[str]]]:
+    """Get a cached lookup result, or None on a miss"""
+    result = _order_mapping_cache.get(aaa_order_id)
+    if result is None:
+        return None
+    _order_mapping_cache.move_to_end(aaa_order_id)
+    return dict(result)
+
+
+def _format_order_rows(order_id: str, columns: List[str], rows: List[tuple]) -> str:
+    """Render order query rows as a markdown table"""
+    lines = [
+        "**Database Query Results**",
+        "",
+        "```sql",
+        ORDER_DETAILS_SQL.replace(":order_id", f"'{order_id}'") + ";",
+        "```",
+        "",
+        "**Results:**",
+        "| " + " | ".join(columns) + " |",
+        "|" + "|".join("-" * (len(col) + 2) for col in columns) + "|"
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join(str(value) for value in row) + " |")
+    
+    if not rows:
+        lines.append(f"\n⚠️ No order found for `{order_id}`")
+    
+    return "\n".join(lines) + "\n"
+
+
+def _lookup_actual_order_id(aaa_order_id: str) -> Dict[str, Optional[str]]:
+    """Resolve an AAA order ID - cached hits skip the database"""
+    cached = _cached_order_mapping(aaa_order_id)
+    if cached is not None:
+        return cached
+    return _cache_order_mapping(_fetch_actual_order_id(aaa_order_id))
+
+
+async def _alookup_actual_order_id(aaa_order_id: str) -> Dict[str, Optional[str]]:
+    """Resolve an AAA order ID (async) - cached hits never touch the pool"""
+    cached = _cached_order_mapping(aaa_order_id)
+    if cached is not None:
+        return cached
+    return _cache_order_mapping(await _afetch_actual_order_id(aaa_order_id))
+
+
+@functools.lru_cache(maxsize=DB_CACHE_SIZE)
+def _query_order_details_cached(order_id: str, ttl_bucket: int) -> str:
+    """
+    Query trade details for an order
+    
+    Args:
+        order_id: Order identifier
+        ttl_bucket: Current TTL window - part of the cache key so
+            entries expire once the window rolls over
+    """
+    pool = _get_pool()
+    
+    if pool is None:
+        return _simulated_order_details(order_id)
+    
+    with pool.acquire() as conn:
+        with conn.cursor() as cur:
+            cur.execute(ORDER_DETAILS_SQL, order_id=order_id)
+            columns = [col[0] for col in cur.description]
+            rows = cur.fetchall()
+    
+    return _format_order_rows(order_id, columns, rows)
+
+
+def _ttl_bucket() -> int:
+    """Current trade details cache window (DB_CACHE_TTL_SECONDS wide)"""
+    return int(time.monotonic() // DB_CACHE_TTL_SECONDS)
+
+
+def _query_order_details(order_id: str) -> str:
+    """Query trade details for an order (cached for DB_CACHE_TTL_SECONDS)"""
+    return _query_order_details_cached(order_id, _ttl_bucket())
+
+
+async def _afetch_order_details(order_id: str) -> str:
+    """Query trade details for an order without blocking the event loop"""
+    pool = _get_async_pool()
+    
+    if pool is None:
+        # Sync pool or simulated data - keep it off the event loop
+        return await asyncio.to_thread(_query_order_details, order_id)
+    
+    async with pool.acquire() as conn:
+        with conn.cursor() as cur:
+            await cur.execute(ORDER_DETAILS_SQL, order_id=order_id)
+            columns = [col[0] for col in cur.description]
+            rows = await cur.fetchall()
+    
+    return _format_order_rows(order_id, columns, rows)
+
+
+async def _aquery_order_details(order_id: str) -> str:
+    """Query trade details for an order (async, cached for DB_CACHE_TTL_SECONDS)"""
+    cache_key = (order_id, _ttl_bucket())
+    details = _aorder_details_cache.get(cache_key)
+    if details is not None:
+        _aorder_details_cache.move_to_end(cache_key)
+        return details
+    
+    details = await _afetch_order_details(order_id)
+    _aorder_details_cache[cache_key] = details
+    while len(_aorder_details_cache) > DB_CACHE_SIZE:
+        _aorder_details_cache.popitem(last=False)
+    return details
+
+
+def _simulated_order_details(order_id: str) -> str:
+    """Simulated trade details used when Oracle is not available"""
+    return f"""**Database Query Results**
 
 ```sql
 SELECT o.order_id, o.client_id, c.tier, o.instrument, 
@@ -86,50 +367,77 @@ WHERE o.order_id = '{order_id}';
 - Spread adjustment: -10% (GOLD tier)
 - Volume discount: Applied for trades > 500K
 """
+
+
+class DatabaseAgent(BaseAgent):
+    """Oracle Database & Configuration Expert"""
     
-    def _execute_tool(self, context: Dict, state: Dict) -> Dict[str, Any]:
+    def __init__(self):
+        super().__init__(
+            name="Database_Agent",
+            system_prompt="""You are the **Database Expert** specializing in:
+- Oracle SQL queries and optimization
+- Trade data retrieval
+- Configuration lookup (pricing rules, client tiers)
+- Data integrity validation
+- Order ID enrichment and lookup
+
+Provide precise SQL queries and interpret database results accurately."""
+        )
+    
+    @classmethod
+    def clear_caches(cls):
+        """Drop memoized order lookups and trade details"""
+        _order_mapping_cache.clear()
+        _query_order_details_cached.cache_clear()
+        _aorder_details_cache.clear()
+    
+    def _get_trade_order_id(self, context: Dict, state: Dict, current_inv: str) -> str:
+        """Order ID for trade data lookup - falls back to the enriched order ID"""
+        order_id = context.get("order_id", "")
+        
+        # Check if we should use actual_order_id from enrichment
+        if not order_id:
+            if current_inv == "comparison":
+                order_id = state.get("comparison_actual_order_id", "")
+            else:
+                order_id = state.get("actual_order_id", "")
+        
+        return order_id
+    
+    def _unavailable_result(self, error: DatabaseUnavailableError) -> Dict[str, Any]:
+        """Tool result reported when Oracle cannot be reached - never simulated data"""
+        logger.error(f"{self.name}: {error}")
+        return {
+            "error": str(error),
+            "summary": "⚠️ Oracle database unavailable - no data retrieved"
+        }
+    
+    def _enrichment_result(self, aaa_order_id: str, lookup_result: Dict, current_inv: str) -> Dict[str, Any]:
         """
-        Execute database queries - handles both enrichment and normal flow
-        Uses separate fields for primary vs comparison orders
+        Build the enrichment findings and state updates for a lookup result
         
         Args:
-            context: Investigation context
-            state: Agent state
+            aaa_order_id: D-prefixed order ID that was looked up
+            lookup_result: Result of lookup_actual_order_id
+            current_inv: Investigation phase ("primary" or "comparison")
             
         Returns:
-            Dict with query results
+            Dict with enrichment results
         """
-        current_inv = state.get("current_investigation", "primary")
+        actual_order_id = lookup_result["actual_order_id"]
         
-        # Get enrichment flags based on current investigation phase
-        if current_inv == "comparison":
-            enrichment_flow = state.get("comparison_enrichment_flow", False)
-            aaa_order_id = state.get("comparison_aaa_order_id")
-            print(f"\n[DB_AGENT] COMPARISON - enrichment_flow={enrichment_flow}, aaa_order_id={aaa_order_id}")
-        else:
-            enrichment_flow = state.get("enrichment_flow", False)
-            aaa_order_id = state.get("aaa_order_id")
-            print(f"\n[DB_AGENT] PRIMARY - enrichment_flow={enrichment_flow}, aaa_order_id={aaa_order_id}")
+        if not actual_order_id:
+            return {
+                "error": f"No order mapping found for {aaa_order_id}",
+                "summary": f"⚠️ AAA Order ID {aaa_order_id} not found in order mappings"
+            }
         
-        if enrichment_flow:
-            # ENRICHMENT MODE: Lookup actual order ID
-            if not aaa_order_id:
-                return {
-                    "error": "Missing aaa_order_id in enrichment flow",
-                    "summary": "⚠️ AAA Order ID required for enrichment lookup"
-                }
-            
-            print(f"[DB_AGENT] ENRICHMENT MODE: Looking up {aaa_order_id}")
-            
-            # Lookup actual order ID
-            lookup_result = self.lookup_actual_order_id.invoke({"aaa_order_id": aaa_order_id})
-            actual_order_id = lookup_result["actual_order_id"]
-            
-            print(f"[DB_AGENT] Enrichment complete: {aaa_order_id} -> {actual_order_id}")
-            
-            # Return enrichment result with state updates based on phase
-            result = {
-                "raw_data": f"""**Order ID Enrichment Completed**
+        logger.debug("[DB_AGENT] Enrichment complete: %s -> %s", aaa_order_id, actual_order_id)
+        
+        # Return enrichment result with state updates based on phase
+        result = {
+            "raw_data": f"""**Order ID Enrichment Completed**
 
 🔍 **Lookup Details:**
 - AAA Order ID (Input): `{aaa_order_id}`
@@ -142,47 +450,123 @@ WHERE o.order_id = '{order_id}';
 ---
 *Note: This order used D-prefix format and required enrichment to find the actual order ID.*
 """,
-                "summary": f"Enriched {aaa_order_id} → {actual_order_id}",
-                "actual_order_id": actual_order_id,
-                "aaa_order_id": aaa_order_id,
-                "enrichment_completed": True
-            }
-            
-            # Add state updates to result based on phase
-            if current_inv == "comparison":
-                result["comparison_actual_order_id"] = actual_order_id
-                result["comparison_enrichment_flow"] = False  # Clear flag
-                print(f"[DB_AGENT] Setting: comparison_actual_order_id={actual_order_id}, comparison_enrichment_flow=False")
-            else:
-                result["actual_order_id"] = actual_order_id
-                result["enrichment_flow"] = False  # Clear flag
-                print(f"[DB_AGENT] Setting: actual_order_id={actual_order_id}, enrichment_flow=False")
-            
-            return result
+            "summary": f"Enriched {aaa_order_id} → {actual_order_id}",
+            "actual_order_id": actual_order_id,
+            "aaa_order_id": aaa_order_id,
+            "enrichment_completed": True
+        }
         
+        # Add state updates to result based on phase
+        if current_inv == "comparison":
+            result["comparison_actual_order_id"] = actual_order_id
+            result["comparison_enrichment_flow"] = False  # Clear flag
+            logger.debug("[DB_AGENT] Setting: comparison_actual_order_id=%s, comparison_enrichment_flow=False", actual_order_id)
         else:
-            # NORMAL MODE: Query trade data
-            order_id = context.get("order_id", "")
-            
-            # Check if we should use actual_order_id from enrichment
-            if not order_id:
-                if current_inv == "comparison":
-                    order_id = state.get("comparison_actual_order_id", "")
-                else:
-                    order_id = state.get("actual_order_id", "")
-            
-            print(f"[DB_AGENT] NORMAL MODE: Querying trade data for {order_id}")
-            
-            if not order_id:
-                return {
-                    "error": "Missing order_id",
-                    "summary": "⚠️ Order ID required for database lookup"
-                }
-            
-            result = self.query_database.invoke({"order_id": order_id})
+            result["actual_order_id"] = actual_order_id
+            result["enrichment_flow"] = False  # Clear flag
+            logger.debug("[DB_AGENT] Setting: actual_order_id=%s, enrichment_flow=False", actual_order_id)
+        
+        return result
+    
+    def _resolve_inputs(self, context: Dict, state: Dict) -> tuple[str, Optional[str], str]:
+        """
+        Decide what to look up for the current investigation phase
+        
+        Uses separate fields for primary vs comparison orders.
+        
+        Args:
+            context: Investigation context
+            state: Agent state
             
+        Returns:
+            Tuple of (mode, lookup_id, phase) - mode is "enrichment" (lookup_id
+            is the AAA order ID) or "trade" (lookup_id is the order ID);
+            lookup_id is empty when it is missing
+        """
+        current_inv = state.get("current_investigation", "primary")
+        
+        # Get enrichment flags based on current investigation phase
+        if current_inv == "comparison":
+            enrichment_flow = state.get("comparison_enrichment_flow", False)
+            aaa_order_id = state.get("comparison_aaa_order_id")
+        else:
+            enrichment_flow = state.get("enrichment_flow", False)
+            aaa_order_id = state.get("aaa_order_id")
+        logger.debug("[DB_AGENT] %s - enrichment_flow=%s, aaa_order_id=%s", current_inv.upper(), enrichment_flow, aaa_order_id)
+        
+        if enrichment_flow:
+            logger.debug("[DB_AGENT] ENRICHMENT MODE: Looking up %s", aaa_order_id)
+            return "enrichment", aaa_order_id, current_inv
+        
+        order_id = self._get_trade_order_id(context, state, current_inv)
+        logger.debug("[DB_AGENT] NORMAL MODE: Querying trade data for %s", order_id)
+        return "trade", order_id, current_inv
+    
+    def _missing_input_result(self, mode: str) -> Dict[str, Any]:
+        """Tool result when the ID needed for the lookup is missing"""
+        if mode == "enrichment":
             return {
-                "raw_data": result,
-                "summary": f"Database records retrieved for {order_id}",
-                "order_id": order_id
+                "error": "Missing aaa_order_id in enrichment flow",
+                "summary": "⚠️ AAA Order ID required for enrichment lookup"
             }
+        return {
+            "error": "Missing order_id",
+            "summary": "⚠️ Order ID required for database lookup"
+        }
+    
+    def _trade_result(self, order_id: str, raw_data: str) -> Dict[str, Any]:
+        """Tool result for a trade data query"""
+        return {
+            "raw_data": raw_data,
+            "summary": f"Database records retrieved for {order_id}",
+            "order_id": order_id
+        }
+    
+    def _execute_tool(self, context: Dict, state: Dict) -> Dict[str, Any]:
+        """
+        Execute database queries - handles both enrichment and normal flow
+        
+        Args:
+            context: Investigation context
+            state: Agent state
+            
+        Returns:
+            Dict with query results
+        """
+        mode, lookup_id, current_inv = self._resolve_inputs(context, state)
+        if not lookup_id:
+            return self._missing_input_result(mode)
+        
+        try:
+            if mode == "enrichment":
+                lookup_result = _lookup_actual_order_id(lookup_id)
+                return self._enrichment_result(lookup_id, lookup_result, current_inv)
+            return self._trade_result(lookup_id, _query_order_details(lookup_id))
+        except DatabaseUnavailableError as e:
+            return self._unavailable_result(e)
+    
+    async def _aexecute_tool(self, context: Dict, state: Dict) -> Dict[str, Any]:
+        """
+        Async variant of _execute_tool
+        
+        Enrichment lookups and trade data queries go through the async
+        Oracle pool.
+        
+        Args:
+            context: Investigation context
+            state: Agent state
+            
+        Returns:
+            Dict with query results
+        """
+        mode, lookup_id, current_inv = self._resolve_inputs(context, state)
+        if not lookup_id:
+            return self._missing_input_result(mode)
+        
+        try:
+            if mode == "enrichment":
+                lookup_result = await _alookup_actual_order_id(lookup_id)
+                return self._enrichment_result(lookup_id, lookup_result, current_inv)
+            return self._trade_result(lookup_id, await _aquery_order_details(lookup_id))
+        except DatabaseUnavailableError as e:
+            return self._unavailable_result(e)
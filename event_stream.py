@@ -0,0 +1,71 @@
+"""
+Graph event streaming - turns LangGraph events into client stream events
+"""
+
+from typing import Any, AsyncIterator, Dict
+
+from langchain_core.messages import AIMessage
+
+
+def _chunk_text(content: Any) -> str:
+    """Text of a streamed LLM chunk (content may be a list of content blocks)"""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") for block in content
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
+
+
+async def stream_graph_events(agent, state: Dict) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the graph and yield stream events as they are produced
+    
+    Event types:
+    - 'token': streamed LLM text, tagged with the graph node
+    - 'agent_message': each new AIMessage, when the node that produced it
+      finishes - including combined nodes that run several agents
+      (parallelinvestigation, parallelcomparison)
+    - 'complete': the graph's final answer (always last)
+    
+    Args:
+        agent: Compiled agent graph
+        state: Initial agent state
+    
+    Yields:
+        Event dicts
+    """
+    final_answer = ""
+    # Nodes may return messages that were already streamed (e.g. the full
+    # state from synthesize) - keep the objects so their ids stay unique
+    emitted: Dict[int, AIMessage] = {}
+    
+    async for event in agent.astream_events(state, version="v2"):
+        kind = event["event"]
+        node = event.get("metadata", {}).get("langgraph_node")
+        
+        if kind == "on_chat_model_stream":
+            content = _chunk_text(event["data"]["chunk"].content)
+            if content:
+                yield {"type": "token", "agent": node, "content": content}
+        
+        elif kind == "on_chain_end" and event["name"] == node:
+            # Graph node finished - emit every message it produced
+            output = event["data"].get("output")
+            if not isinstance(output, dict):
+                continue
+            for msg in output.get("messages", []):
+                if not isinstance(msg, AIMessage) or id(msg) in emitted:
+                    continue
+                emitted[id(msg)] = msg
+                yield {
+                    "type": "agent_message",
+                    "agent": msg.name or node,
+                    "content": msg.content
+                }
+        
+        elif kind == "on_chain_end" and event["name"] == "LangGraph":
+            output = event["data"].get("output") or {}
+            final_answer = output.get("final_answer", "")
+    
+    yield {"type": "complete", "answer": final_answer}
@@ -0,0 +1,176 @@
+"""
+Background job storage for async API endpoints
+Bounded in-memory store for a single worker, Redis for multiple workers
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+import json
+import time
+
+from config.settings import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_KEY_PREFIX = "pricing-agent:job:"
+
+
+class JobStore(ABC):
+    """Storage for background job status and results"""
+    
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job
+        
+        Args:
+            job_id: Job identifier
+        
+        Returns:
+            Job dict, or None if unknown or expired
+        """
+        pass
+    
+    @abstractmethod
+    async def set(self, job_id: str, job: Dict[str, Any]) -> None:
+        """
+        Store a job, replacing any existing entry
+        
+        Args:
+            job_id: Job identifier
+            job: Job status dict (must be JSON serializable)
+        """
+        pass
+    
+    async def update(self, job_id: str, **fields: Any) -> None:
+        """
+        Update fields of an existing job
+        
+        Args:
+            job_id: Job identifier
+            **fields: Fields to set on the job
+        """
+        job = await self.get(job_id) or {}
+        job.update(fields)
+        await self.set(job_id, job)
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Bounded in-memory job store with TTL expiry
+    
+    Only visible to the current worker process - use RedisJobStore
+    when running multiple Uvicorn workers.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl_seconds: int = 3600,
+        purge_interval_seconds: int = 900
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._jobs: "OrderedDict[str, tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._next_purge = time.monotonic() + purge_interval_seconds
+    
+    def purge_expired(self) -> int:
+        """
+        Drop expired jobs
+        
+        Jobs are kept in write order and all share the same TTL, so expired
+        jobs are always at the front - stops at the first live job.
+        
+        Returns:
+            Number of jobs removed
+        """
+        now = time.monotonic()
+        removed = 0
+        while self._jobs:
+            _, expires_at = next(iter(self._jobs.values()))
+            if expires_at > now:
+                break
+            self._jobs.popitem(last=False)
+            removed += 1
+        
+        self._next_purge = now + self.purge_interval_seconds
+        if removed:
+            logger.debug("Purged %d expired jobs", removed)
+        return removed
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return None
+        
+        job, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._jobs[job_id]
+            return None
+        
+        return job
+    
+    async def set(self, job_id: str, job: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        self._jobs[job_id] = (job, now + self.ttl_seconds)
+        self._jobs.move_to_end(job_id)
+        
+        # Periodically sweep finished jobs nobody polled again
+        if now >= self._next_purge:
+            self.purge_expired()
+        
+        # Evict oldest jobs once over capacity
+        while len(self._jobs) > self.maxsize:
+            self._jobs.popitem(last=False)
+    
+    async def update(self, job_id: str, **fields: Any) -> None:
+        # Update in place - keeps the original expiry
+        job = await self.get(job_id)
+        if job is None:
+            await self.set(job_id, dict(fields))
+        else:
+            job.update(fields)
+
+
+class RedisJobStore(JobStore):
+    """Redis-backed job store shared across workers"""
+    
+    def __init__(self, url: str, ttl_seconds: int = 3600):
+        import redis.asyncio as redis
+        
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis.from_url(url, decode_responses=True)
+    
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        payload = await self._redis.get(JOB_KEY_PREFIX + job_id)
+        return json.loads(payload) if payload else None
+    
+    async def set(self, job_id: str, job: Dict[str, Any]) -> None:
+        await self._redis.set(
+            JOB_KEY_PREFIX + job_id,
+            json.dumps(job, default=str),
+            ex=self.ttl_seconds
+        )
+
+
+def create_job_store() -> JobStore:
+    """
+    Create the job store configured by settings.job_store_backend
+    
+    Returns:
+        RedisJobStore for "redis", otherwise InMemoryJobStore
+    """
+    backend = getattr(settings, "job_store_backend", "memory")
+    ttl_seconds = getattr(settings, "job_ttl_seconds", 3600)
+    
+    if backend == "redis":
+        logger.info(f"Using Redis job store: {settings.redis_url}")
+        return RedisJobStore(settings.redis_url, ttl_seconds=ttl_seconds)
+    
+    return InMemoryJobStore(
+        maxsize=getattr(settings, "job_store_maxsize", 10_000),
+        ttl_seconds=ttl_seconds
+    )
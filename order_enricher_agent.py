@@ -5,6 +5,14 @@ Extends BaseAgent for consistency with other agents
 
 from src.agents.base_agent import BaseAgent
 from typing import Dict, Any
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# D-prefix followed by 8 digits or uppercase letters (9 total)
+_ORDER_RE = re.compile(r"D[0-9A-Z]{8}")
+_DOT_STRIPPER = str.maketrans("", "", ".")
 
 
 class OrderEnricherAgent(BaseAgent):
@@ -36,11 +44,11 @@ Your role is to transform D-prefixed order IDs into a clean format for database
         Returns:
             Cleaned order ID (e.g., "D12345678")
         """
-        return order_id.replace(".", "")
+        return order_id.translate(_DOT_STRIPPER)
     
     def validate_order_format(self, order_id: str) -> tuple[bool, str]:
         """
-        Validate that order ID matches D-prefix format with 9 characters
+        Validate that order ID matches D-prefix format with 9 alphanumeric characters
         
         Args:
             order_id: Cleaned order ID
@@ -48,6 +56,10 @@ Your role is to transform D-prefixed order IDs into a clean format for database
         Returns:
             Tuple of (is_valid, error_message)
         """
+        # Fast path - valid IDs need a single match
+        if _ORDER_RE.fullmatch(order_id):
+            return True, ""
+        
         if not order_id:
             return False, "Order ID is empty"
         
@@ -57,7 +69,7 @@ Your role is to transform D-prefixed order IDs into a clean format for database
         if len(order_id) != 9:
             return False, f"Order ID must be 9 characters, got: {len(order_id)}"
         
-        return True, ""
+        return False, f"Order ID must contain only digits and uppercase letters, got: {order_id}"
     
     def _execute_tool(self, context: Dict, state: Dict) -> Dict[str, Any]:
         """
@@ -142,10 +154,10 @@ Expected format: D-prefix with 9 characters total (e.g., D12345678 or D12.345.67
         if current_inv == "comparison":
             state["comparison_aaa_order_id"] = clean_order_id
             state["comparison_enrichment_flow"] = True
-            print(f"[ORDER_ENRICHER] Comparison: comparison_aaa_order_id={clean_order_id}, comparison_enrichment_flow=True")
+            logger.debug("[ORDER_ENRICHER] Comparison: comparison_aaa_order_id=%s, comparison_enrichment_flow=True", clean_order_id)
         else:
             state["aaa_order_id"] = clean_order_id
             state["enrichment_flow"] = True
-            print(f"[ORDER_ENRICHER] Primary: aaa_order_id={clean_order_id}, enrichment_flow=True")
+            logger.debug("[ORDER_ENRICHER] Primary: aaa_order_id=%s, enrichment_flow=True", clean_order_id)
         
         return result
@@ -3,14 +3,24 @@ Query Parameters - Structured output model for supervisor analysis
 Updated with date handling
 """
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, Literal
 from src.utils.date_handler import DateHandler
 
+# Single-order intents that need a date whenever an order ID is given
+DATED_ORDER_INTENTS = frozenset({"Investigation", "Data"})
+
 
 class QueryParameters(BaseModel):
     """Structured parameters extracted from user query"""
     
+    # Frozen - use model_copy(update=...) to derive changed parameters
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        frozen=True,
+        extra="forbid"
+    )
+    
     intent: Literal[
         "Knowledge",
         "Data", 
@@ -65,25 +75,27 @@ class QueryParameters(BaseModel):
         
         return DateHandler.normalize_date(v)
     
-    def ensure_dates_set(self) -> None:
+    def ensure_dates_set(self) -> "QueryParameters":
         """
         Ensure dates are set for orders that need them
         Call this after parameter extraction
+        
+        Returns:
+            Parameters with missing dates filled in (self if nothing changed)
         """
+        updates = {}
+        
         # For Investigation/Data intents with order_id, ensure date is set
-        if self.intent in ["Investigation", "Data"] and self.order_id:
+        if self.intent in DATED_ORDER_INTENTS and self.order_id:
             if not self.date:
-                self.date = DateHandler.get_current_date()
+                updates["date"] = DateHandler.get_current_date()
         
         # For Comparison intent, ensure both dates are set if orders exist
         if self.intent == "Comparison":
             if self.order_id and not self.date:
-                self.date = DateHandler.get_current_date()
+                updates["date"] = DateHandler.get_current_date()
             
             if self.comparison_order_id and not self.comparison_date:
-                self.comparison_date = DateHandler.get_current_date()
-    
-    class Config:
-        """Pydantic config"""
-        str_strip_whitespace = True
-        validate_assignment = True
+                updates["comparison_date"] = DateHandler.get_current_date()
+        
+        return self.model_copy(update=updates) if updates else self
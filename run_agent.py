@@ -6,6 +6,8 @@ Fixed to work with updated QueryParameters
 
 import sys
 import os
+import logging
+import traceback
 from pathlib import Path
 
 # Add src to path
@@ -17,10 +19,16 @@ import argparse
 from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
 from rich.table import Table
+from rich.style import Style
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional - JSON output falls back to rich's stdlib encoder
+    orjson = None
+
 from src.graph.workflow import create_supervisor_graph
 from src.models.state import AgentState
 from src.models.query_parameters import QueryParameters
@@ -29,32 +37,73 @@ from config.settings import settings
 
 console = Console()
 
+# Table styles parsed once, reused for every summary/config table
+_KEY_STYLE = Style.parse("cyan")
+_VALUE_STYLE = Style.parse("green")
+_HEADER_STYLE = Style.parse("bold magenta")
+
+
+def _make_table(title: str, key_header: str, **kwargs) -> Table:
+    """Create a two-column key/value table (key_header | Value)"""
+    table = Table(title=title, show_header=True, **kwargs)
+    table.add_column(key_header, style=_KEY_STYLE)
+    table.add_column("Value", style=_VALUE_STYLE)
+    return table
+
+
+def _get_agent():
+    """Get the compiled supervisor graph (built on first use, then reused)"""
+    return create_supervisor_graph()
+
+
+# Immutable part of the initial state, shared by every query.
+# Placeholder parameters skip validation (the Supervisor replaces them) and
+# are frozen, so a single instance is safe to share.
+_INITIAL_STATE_TEMPLATE = {
+    "user_query": "",
+    "parameters": QueryParameters.model_construct(
+        intent="Investigation",
+        reasoning="Initial state",
+        order_id="",
+        date="",
+        comparison_order_id="",
+        comparison_date=""
+    ),
+    "investigation_step": 0,
+    "final_answer": "",
+    "sender": "",
+    "current_investigation": "primary",
+    # Primary order enrichment fields
+    "aaa_order_id": None,
+    "enrichment_flow": False,
+    "actual_order_id": None,
+    # Comparison order enrichment fields
+    "comparison_aaa_order_id": None,
+    "comparison_enrichment_flow": False,
+    "comparison_actual_order_id": None
+}
+
 
 def create_initial_state(query: str) -> AgentState:
     """Create initial agent state"""
-    return {
-        "messages": [],
-        "user_query": query,
-        "parameters": QueryParameters(
-            intent="Investigation",
-            reasoning="Initial state"
-        ),
-        "investigation_step": 0,
-        "findings": {},
-        "comparison_findings": {},
-        "final_answer": "",
-        "sender": "",
-        "current_investigation": "primary",
-        "error_log": [],
-        # Primary order enrichment fields
-        "aaa_order_id": None,
-        "enrichment_flow": False,
-        "actual_order_id": None,
-        # Comparison order enrichment fields
-        "comparison_aaa_order_id": None,
-        "comparison_enrichment_flow": False,
-        "comparison_actual_order_id": None
-    }
+    state = _INITIAL_STATE_TEMPLATE.copy()
+    # Mutable containers must be fresh per request
+    state["messages"] = []
+    state["findings"] = {}
+    state["comparison_findings"] = {}
+    state["error_log"] = []
+    state["user_query"] = query
+    return state
+
+
+def _agents_used(messages, exclude_supervisor: bool = True) -> list:
+    """Unique agent names in order of first appearance (single pass)"""
+    seen = {}
+    for msg in messages:
+        name = getattr(msg, "name", None)
+        if name and not (exclude_supervisor and name == "Supervisor"):
+            seen[name] = None
+    return list(seen)
 
 
 def display_header():
@@ -90,15 +139,10 @@ def display_agent_messages(state: AgentState):
 
 def display_summary(state: AgentState):
     """Display execution summary"""
-    table = Table(title="Execution Summary", show_header=True, header_style="bold magenta")
-    table.add_column("Metric", style="cyan")
-    table.add_column("Value", style="green")
+    table = _make_table("Execution Summary", "Metric", header_style=_HEADER_STYLE)
     
     # Count agents used
-    agents_used = set()
-    for msg in state["messages"]:
-        if hasattr(msg, 'name') and msg.name and msg.name != "Supervisor":
-            agents_used.add(msg.name)
+    agents_used = _agents_used(state["messages"])
     
     params = state.get("parameters")
     table.add_row("Intent", params.intent if params else "Unknown")
@@ -139,7 +183,7 @@ def run_interactive_mode():
         console=console
     ) as progress:
         task = progress.add_task("[cyan]Initializing agent system...", total=None)
-        agent = create_supervisor_graph()
+        agent = _get_agent()
         progress.update(task, completed=True)
     
     console.print("[green]✓[/green] Agent system ready!\n")
@@ -207,7 +251,6 @@ def run_interactive_mode():
             console.print("\n\n[yellow]Interrupted. Type 'exit' to quit.[/yellow]")
         except Exception as e:
             console.print(f"\n[red]Error: {str(e)}[/red]")
-            import traceback
             if "--debug" in sys.argv:
                 console.print(f"[dim]{traceback.format_exc()}[/dim]")
 
@@ -222,7 +265,7 @@ def run_single_query(query: str, output_format: str = "pretty"):
         console=console
     ) as progress:
         task = progress.add_task("[cyan]Initializing agent...", total=None)
-        agent = create_supervisor_graph()
+        agent = _get_agent()
         progress.update(task, description="[cyan]Executing query...")
         
         state = create_initial_state(query)
@@ -231,7 +274,6 @@ def run_single_query(query: str, output_format: str = "pretty"):
         progress.update(task, completed=True)
     
     if output_format == "json":
-        import json
         params = result.get("parameters")
         output = {
             "query": query,
@@ -242,13 +284,13 @@ def run_single_query(query: str, output_format: str = "pretty"):
             "comparison_date": params.comparison_date if params else None,
             "enriched_order_id": result.get("actual_order_id"),
             "final_answer": result.get("final_answer", ""),
-            "agents_used": list(set(
-                msg.name for msg in result["messages"] 
-                if hasattr(msg, 'name') and msg.name
-            )),
+            "agents_used": _agents_used(result["messages"], exclude_supervisor=False),
             "errors": result.get("error_log", [])
         }
-        console.print_json(data=output)
+        if orjson:
+            console.print(orjson.dumps(output, option=orjson.OPT_INDENT_2).decode(), highlight=False)
+        else:
+            console.print_json(data=output)
     elif output_format == "markdown":
         md = Markdown(result.get("final_answer", "No answer generated"))
         console.print(md)
@@ -257,8 +299,8 @@ def run_single_query(query: str, output_format: str = "pretty"):
         display_summary(result)
 
 
-def run_batch_mode(file_path: str):
-    """Run queries from a file"""
+def run_batch_mode(file_path: str, concurrency: int = 4):
+    """Run queries from a file (up to `concurrency` queries at a time)"""
     console.print(f"\n[cyan]Batch Mode:[/cyan] {file_path}\n")
     
     if not os.path.exists(file_path):
@@ -277,33 +319,54 @@ def run_batch_mode(file_path: str):
         console=console
     ) as progress:
         task = progress.add_task("[cyan]Initializing agent...", total=None)
-        agent = create_supervisor_graph()
+        agent = _get_agent()
         progress.update(task, completed=True)
     
-    results = []
-    
-    for i, query in enumerate(queries, 1):
-        console.print(f"\n[bold cyan]Query {i}/{len(queries)}:[/bold cyan] {query}")
-        
-        try:
-            state = create_initial_state(query)
-            result = agent.invoke(state)
-            
-            results.append({
-                "query": query,
-                "success": True,
-                "answer": result.get("final_answer", "")
-            })
+    async def run_query(i: int, query: str, semaphore: asyncio.Semaphore, progress: Progress, task) -> dict:
+        async with semaphore:
+            console.print(f"\n[bold cyan]Query {i}/{len(queries)}:[/bold cyan] {query}")
             
-            console.print("[green]✓ Completed[/green]")
+            try:
+                state = create_initial_state(query)
+                result = await agent.ainvoke(state)
+                
+                console.print(f"[green]✓ Completed ({i}/{len(queries)})[/green]")
+                
+                return {
+                    "query": query,
+                    "success": True,
+                    "answer": result.get("final_answer", "")
+                }
+                
+            except Exception as e:
+                console.print(f"[red]✗ Error ({i}/{len(queries)}): {str(e)}[/red]")
+                return {
+                    "query": query,
+                    "success": False,
+                    "error": str(e)
+                }
             
-        except Exception as e:
-            console.print(f"[red]✗ Error: {str(e)}[/red]")
-            results.append({
-                "query": query,
-                "success": False,
-                "error": str(e)
-            })
+            finally:
+                progress.advance(task)
+    
+    async def run_all() -> list:
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        # Single progress bar for the whole batch - queries finish out of order
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task(f"[cyan]Running queries (x{concurrency})...", total=len(queries))
+            return await asyncio.gather(*(
+                run_query(i, query, semaphore, progress, task)
+                for i, query in enumerate(queries, 1)
+            ))
+    
+    results = asyncio.run(run_all())
     
     # Summary
     success_count = sum(1 for r in results if r.get("success"))
@@ -352,6 +415,13 @@ Examples:
         help='Execute queries from a file (one per line)'
     )
     
+    parser.add_argument(
+        '-c', '--concurrency',
+        type=int,
+        default=4,
+        help='Max queries running at once in batch mode (default: 4)'
+    )
+    
     parser.add_argument(
         '-f', '--format',
         type=str,
@@ -374,16 +444,13 @@ Examples:
     
     args = parser.parse_args()
     
-    # Setup logging
-    if args.debug:
-        import logging
+    # Setup logging (DEBUG_AGENTS=1 enables agent debug output without --debug)
+    if args.debug or os.getenv("DEBUG_AGENTS") == "1":
         logging.basicConfig(level=logging.DEBUG)
     
     # Show configuration
     if args.show_config:
-        table = Table(title="Current Configuration", show_header=True)
-        table.add_column("Setting", style="cyan")
-        table.add_column("Value", style="green")
+        table = _make_table("Current Configuration", "Setting")
         
         table.add_row("Environment", settings.app_env)
         table.add_row("Supervisor Model", settings.supervisor_model)
@@ -407,7 +474,7 @@ Examples:
         run_single_query(args.query, args.format)
     elif args.batch:
         display_header()
-        run_batch_mode(args.batch)
+        run_batch_mode(args.batch, concurrency=args.concurrency)
     else:
         # Interactive mode
         run_interactive_mode()
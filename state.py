@@ -9,10 +9,25 @@ import operator
 
 
 def update_dict(left: dict, right: dict) -> dict:
-    """Merge two dictionaries without overwriting"""
-    result = {**left}
-    result.update(right)
-    return result
+    """
+    Merge two dictionaries without overwriting
+    
+    Copy-on-merge: the previous channel value is never mutated, since it may
+    be shared with checkpoints and with parallel branches reading it.
+    """
+    if not right:
+        return left if left is not None else {}
+    if left is None:
+        return dict(right)
+    return {**left, **right}
+
+
+RECENT_AGENTS_WINDOW = 5
+
+
+def append_recent(left: Optional[list], right: list) -> list:
+    """Append agent names, keeping only the most recent RECENT_AGENTS_WINDOW"""
+    return ((left or []) + right)[-RECENT_AGENTS_WINDOW:]
 
 
 def replace_value(left: Any, right: Any) -> Any:
@@ -32,10 +47,12 @@ class AgentState(TypedDict):
     investigation_step: Annotated[int, replace_value]
     current_investigation: Annotated[str, replace_value]  # "primary" or "comparison"
     sender: Annotated[str, replace_value]  # Last agent that executed - CAN BE UPDATED
+    recent_agents: Annotated[list[str], append_recent]  # Last few agents that executed, oldest first
     
     # Findings storage (merged, not replaced)
     findings: Annotated[dict, update_dict]  # Findings from each agent
     comparison_findings: Annotated[dict, update_dict]  # Comparison findings
+    splunk_logs_found: Annotated[Optional[bool], replace_value]  # Splunk found logs for the primary order
     
     # Primary order enrichment fields (can be updated multiple times)
     aaa_order_id: Annotated[Optional[str], replace_value]
@@ -5,7 +5,70 @@ Analyzes all agent findings and creates detailed, actionable summaries
 
 from src.agents.base_agent import BaseAgent
 from typing import Dict, Any
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import HumanMessage
+import json
+
+# Key fields listed under each finding, paired with their display labels
+_KEY_FIELDS = tuple(
+    (key, key.replace('_', ' ').title())
+    for key in ("order_id", "logs_found", "enriched", "status", "enrichment_completed", "actual_order_id")
+)
+
+# Formatted findings above this size are sent to the LLM in compact form
+COMPACT_FINDINGS_THRESHOLD = 8000
+COMPACT_ANALYSIS_CHARS = 500
+
+# Task and formatting instructions appended to every summary prompt
+SUMMARY_INSTRUCTIONS = """
+---
+
+## Your Task
+
+Create a **comprehensive, executive-ready summary** that includes:
+
+### 1. Executive Summary (2-3 sentences)
+A high-level overview of what was investigated and the key outcome.
+
+### 2. Key Findings
+List the most important discoveries, organized by topic:
+- Order processing status
+- Any errors or issues identified
+- Performance metrics
+- Configuration details
+
+### 3. Technical Details
+Provide relevant technical information:
+- Splunk log analysis (if available)
+- Database query results
+- API responses
+- System health metrics
+
+### 4. Issues & Anomalies (if any)
+Highlight any problems discovered:
+- Error messages
+- Unexpected behavior
+- Performance issues
+- Configuration problems
+
+### 5. Recommendations (if applicable)
+Suggest next steps or actions based on findings.
+
+### 6. Comparison Analysis (for comparison intent only)
+If this is a comparison, provide:
+- Side-by-side analysis of key differences
+- Similarities and patterns
+- Potential reasons for differences
+
+## Formatting Guidelines
+- Use **clear section headers**
+- Use bullet points for lists
+- **Bold** important terms and values
+- Use `code formatting` for technical identifiers (order IDs, error codes)
+- Keep it concise but comprehensive
+- Focus on actionable insights
+
+Generate the summary now:
+"""
 
 
 class SummarizationAgent(BaseAgent):
@@ -49,18 +112,18 @@ Always provide a summary that both technical and non-technical stakeholders can
         Returns:
             Dictionary of organized findings
         """
-        findings = state.get("findings", {})
-        comparison_findings = state.get("comparison_findings", {})
         params = state.get("parameters")
+        # Read parameter fields straight from the model's field dict
+        param_fields = vars(params) if params else {}
         
         return {
-            "primary_findings": findings,
-            "comparison_findings": comparison_findings,
-            "intent": params.intent if params else "Unknown",
-            "order_id": params.order_id if params else "",
-            "date": params.date if params else "",
-            "comparison_order_id": params.comparison_order_id if params else "",
-            "comparison_date": params.comparison_date if params else "",
+            "primary_findings": state.get("findings", {}),
+            "comparison_findings": state.get("comparison_findings", {}),
+            "intent": param_fields.get("intent", "Unknown"),
+            "order_id": param_fields.get("order_id", ""),
+            "date": param_fields.get("date", ""),
+            "comparison_order_id": param_fields.get("comparison_order_id", ""),
+            "comparison_date": param_fields.get("comparison_date", ""),
             "user_query": state.get("user_query", ""),
             "enriched": state.get("actual_order_id") is not None
         }
@@ -102,24 +165,97 @@ Always provide a summary that both technical and non-technical stakeholders can
         
         return "\n".join(formatted_sections)
     
+    @staticmethod
+    def _has_content(findings: Dict[str, Any]) -> bool:
+        """
+        Check whether any agent call left a summary or analysis to summarize
+        
+        Failed agents are stored with empty summary and analysis, so a
+        findings dict holding only those gives the LLM nothing to work with.
+        
+        Args:
+            findings: Agent findings dictionary
+            
+        Returns:
+            True if at least one call has a non-empty summary or analysis
+        """
+        for agent_data in findings.values():
+            calls = agent_data if isinstance(agent_data, list) else [agent_data]
+            for call_data in calls:
+                if isinstance(call_data, dict) and (call_data.get("summary") or call_data.get("analysis")):
+                    return True
+        return False
+    
+    def _format_compact_findings(self, findings: Dict[str, Any]) -> str:
+        """
+        Format agent findings as JSON lines for large investigations
+        
+        One line per agent call with the summary, a truncated analysis and
+        the key fields - the LLM expands it into markdown itself.
+        
+        Args:
+            findings: Agent findings dictionary
+            
+        Returns:
+            JSON lines string of findings
+        """
+        lines = []
+        
+        for agent_name, agent_data in findings.items():
+            calls = agent_data if isinstance(agent_data, list) else [agent_data]
+            
+            for call_data in calls:
+                if not isinstance(call_data, dict):
+                    continue
+                
+                entry = {
+                    "agent": agent_name,
+                    "summary": call_data.get("summary", ""),
+                    "analysis": str(call_data.get("analysis", ""))[:COMPACT_ANALYSIS_CHARS]
+                }
+                for key, _ in _KEY_FIELDS:
+                    if call_data.get(key) is not None:
+                        entry[key] = call_data[key]
+                
+                lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+        
+        return "\n".join(lines)
+    
+    def _format_findings_for_prompt(self, findings: Dict[str, Any]) -> str:
+        """
+        Format findings for the summary prompt, compacting large ones
+        
+        Args:
+            findings: Agent findings dictionary
+            
+        Returns:
+            Markdown sections, or JSON lines once over COMPACT_FINDINGS_THRESHOLD
+        """
+        formatted = self._format_agent_findings(findings)
+        if len(formatted) <= COMPACT_FINDINGS_THRESHOLD:
+            return formatted
+        
+        return "\n(Compact JSON lines, one per agent call)\n" + self._format_compact_findings(findings)
+    
     def _format_single_finding(self, agent_name: str, agent_data: dict) -> str:
         """Format a single agent finding"""
-        section = f"\n## {agent_name}\n"
+        parts = [f"\n## {agent_name}\n"]
         
         # Add summary if available
         if "summary" in agent_data:
-            section += f"**Summary:** {agent_data['summary']}\n\n"
+            parts.append(f"**Summary:** {agent_data['summary']}\n\n")
         
         # Add analysis if available
         if "analysis" in agent_data:
-            section += f"**Analysis:** {agent_data['analysis']}\n\n"
+            parts.append(f"**Analysis:** {agent_data['analysis']}\n\n")
         
         # Add key fields
-        for key in ["order_id", "logs_found", "enriched", "status", "enrichment_completed", "actual_order_id"]:
-            if key in agent_data and agent_data[key] is not None:
-                section += f"- **{key.replace('_', ' ').title()}:** {agent_data[key]}\n"
+        for key, label in _KEY_FIELDS:
+            value = agent_data.get(key)
+            if value is not None:
+                parts.append(f"- **{label}:** {value}\n")
         
-        return section
+        return "".join(parts)
     
     def _generate_summary_prompt(self, all_findings: Dict[str, Any]) -> str:
         """
@@ -135,90 +271,41 @@ Always provide a summary that both technical and non-technical stakeholders can
         user_query = all_findings["user_query"]
         
         # Format primary findings
-        primary_formatted = self._format_agent_findings(all_findings["primary_findings"])
+        primary_formatted = self._format_findings_for_prompt(all_findings["primary_findings"])
         
         # Base prompt
-        prompt = f"""# Investigation Summary Request
+        parts = [f"""# Investigation Summary Request
 
 **User Query:** {user_query}
 **Intent:** {intent}
 
 ## Context
-"""
+"""]
         
         # Add order context
         if all_findings["order_id"]:
-            prompt += f"- **Order ID:** {all_findings['order_id']}"
+            parts.append(f"- **Order ID:** {all_findings['order_id']}")
             if all_findings["enriched"]:
-                prompt += " ✅ (Enriched from D-prefix)"
-            prompt += f"\n- **Date:** {all_findings['date']}\n"
+                parts.append(" ✅ (Enriched from D-prefix)")
+            parts.append(f"\n- **Date:** {all_findings['date']}\n")
         
         # Add comparison context if applicable
         if intent == "Comparison" and all_findings["comparison_order_id"]:
-            prompt += f"- **Comparison Order ID:** {all_findings['comparison_order_id']}\n"
-            prompt += f"- **Comparison Date:** {all_findings['comparison_date']}\n"
+            parts.append(f"- **Comparison Order ID:** {all_findings['comparison_order_id']}\n")
+            parts.append(f"- **Comparison Date:** {all_findings['comparison_date']}\n")
         
         # Add primary findings
-        prompt += f"\n## Agent Findings\n{primary_formatted}\n"
+        parts.append(f"\n## Agent Findings\n{primary_formatted}\n")
         
         # Add comparison findings if available
         if all_findings["comparison_findings"]:
-            comparison_formatted = self._format_agent_findings(all_findings["comparison_findings"])
-            prompt += f"\n## Comparison Order Findings\n{comparison_formatted}\n"
+            comparison_formatted = self._format_findings_for_prompt(all_findings["comparison_findings"])
+            parts.append(f"\n## Comparison Order Findings\n{comparison_formatted}\n")
         
         # Add instructions
-        prompt += """
----
-
-## Your Task
-
-Create a **comprehensive, executive-ready summary** that includes:
-
-### 1. Executive Summary (2-3 sentences)
-A high-level overview of what was investigated and the key outcome.
-
-### 2. Key Findings
-List the most important discoveries, organized by topic:
-- Order processing status
-- Any errors or issues identified
-- Performance metrics
-- Configuration details
-
-### 3. Technical Details
-Provide relevant technical information:
-- Splunk log analysis (if available)
-- Database query results
-- API responses
-- System health metrics
-
-### 4. Issues & Anomalies (if any)
-Highlight any problems discovered:
-- Error messages
-- Unexpected behavior
-- Performance issues
-- Configuration problems
-
-### 5. Recommendations (if applicable)
-Suggest next steps or actions based on findings.
-
-### 6. Comparison Analysis (for comparison intent only)
-If this is a comparison, provide:
-- Side-by-side analysis of key differences
-- Similarities and patterns
-- Potential reasons for differences
-
-## Formatting Guidelines
-- Use **clear section headers**
-- Use bullet points for lists
-- **Bold** important terms and values
-- Use `code formatting` for technical identifiers (order IDs, error codes)
-- Keep it concise but comprehensive
-- Focus on actionable insights
-
-Generate the summary now:
-"""
+        parts.append(SUMMARY_INSTRUCTIONS)
         
-        return prompt
+        return "".join(parts)
     
     def _execute_tool(self, context: Dict, state: Dict) -> Dict[str, Any]:
         """
@@ -235,18 +322,38 @@ Generate the summary now:
         all_findings = self._extract_all_findings(state)
         
         # Check if there are any findings to summarize
-        if not all_findings["primary_findings"] and not all_findings["comparison_findings"]:
+        if not (
+            self._has_content(all_findings["primary_findings"])
+            or self._has_content(all_findings["comparison_findings"])
+        ):
             return {
                 "raw_data": "No findings available to summarize.",
                 "summary": "No agent findings were collected."
             }
         
+        # A single Data lookup needs no synthesis - pass its findings through
+        primary_findings = all_findings["primary_findings"]
+        if (
+            all_findings["intent"] == "Data"
+            and len(primary_findings) == 1
+            and not all_findings["comparison_findings"]
+        ):
+            [(agent_name, agent_data)] = primary_findings.items()
+            if isinstance(agent_data, dict):
+                passthrough = self._format_single_finding(agent_name, agent_data)
+                return {
+                    "raw_data": passthrough,
+                    "summary": agent_data.get("summary") or f"Findings from {agent_name}",
+                    "full_summary": passthrough,
+                    "status": "bypassed"
+                }
+        
         # Generate summary prompt
         summary_prompt = self._generate_summary_prompt(all_findings)
         
         # Call LLM to generate summary
         messages = [
-            SystemMessage(content=self.system_prompt),
+            self.system_message,
             HumanMessage(content=summary_prompt)
         ]
         
@@ -13,41 +13,20 @@ from src.agents.comparison_agent import ComparisonAgent
 from src.agents.summarization_agent import SummarizationAgent
 from src.agents.order_enricher_agent import OrderEnricherAgent  # NEW!
 from src.models.query_parameters import QueryParameters
+from src.utils.date_handler import DateHandler
 from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+import threading
 from config import settings
 
+QUERY_CACHE_SIZE = getattr(settings, "query_cache_size", 256)
 
-class SupervisorAgent:
-    """Orchestrates specialist agents and synthesizes findings"""
-    
-    def __init__(self):
-        self.name = "Supervisor"
-        self.llm = ChatAnthropic(
-            model=settings.supervisor_model,
-            temperature=0
-        ).with_structured_output(QueryParameters)
-        
-        # Initialize all specialist agents (including Order Enricher and Summarization)
-        self.agents = {
-            "VectorDB_Agent": VectorDBAgent(),
-            "Splunk_Agent": SplunkAgent(),
-            "Database_Agent": DatabaseAgent(),
-            "DebugAPI_Agent": DebugAPIAgent(),
-            "Monitoring_Agent": MonitoringAgent(),
-            "Code_Agent": CodeAgent(),
-            "Comparison_Agent": ComparisonAgent(),
-            "Order_Enricher_Agent": OrderEnricherAgent(),  # NEW!
-            "Summarization_Agent": SummarizationAgent()
-        }
-    
-    def analyze_query(self, state: Dict) -> Dict:
-        """Analyze query with structured output - handles date normalization"""
-        
-        analysis_prompt = f"""Analyze this financial trading query:
+# Parameter extraction prompt - only the user query varies
+ANALYSIS_PROMPT_TEMPLATE = """Analyze this financial trading query:
 
-**User Query:** {state['user_query']}
+**User Query:** {user_query}
 
 **Instructions:**
 - Determine intent (Knowledge/Data/Debug/Investigation/Monitoring/CodeAnalysis/Comparison)
@@ -72,52 +51,186 @@ class SupervisorAgent:
 - "Compare order ABC123 from yesterday with DEF456 from today" → Extract both dates
 
 Provide structured output."""
+
+
+class SupervisorAgent:
+    """Orchestrates specialist agents and synthesizes findings"""
+    
+    # All specialist agents (including Order Enricher and Summarization)
+    AGENT_CLASSES = {
+        "VectorDB_Agent": VectorDBAgent,
+        "Splunk_Agent": SplunkAgent,
+        "Database_Agent": DatabaseAgent,
+        "DebugAPI_Agent": DebugAPIAgent,
+        "Monitoring_Agent": MonitoringAgent,
+        "Code_Agent": CodeAgent,
+        "Comparison_Agent": ComparisonAgent,
+        "Order_Enricher_Agent": OrderEnricherAgent,  # NEW!
+        "Summarization_Agent": SummarizationAgent
+    }
+    
+    def __init__(self):
+        self.name = "Supervisor"
+        self.llm = ChatAnthropic(
+            model=settings.supervisor_model,
+            temperature=0
+        ).with_structured_output(QueryParameters)
         
-        try:
-            params: QueryParameters = self.llm.invoke(analysis_prompt)
-            
-            # Ensure dates are properly set
-            params.ensure_dates_set()
-            
-            # Format date display
-            date_info = ""
-            if params.date:
-                date_info = f"\nDate: {params.date}"
+        # Specialist agents are created on first use - most queries only need a few
+        self._agents: Dict[str, BaseAgent] = {}
+        
+        # LLM parameter extractions by (current date, user query) (LRU)
+        self._query_cache: "OrderedDict[tuple[str, str], QueryParameters]" = OrderedDict()
+        # Shared by concurrent requests (async handlers, batch runs, worker threads)
+        self._query_cache_lock = threading.Lock()
+    
+    def get_agent(self, name: str) -> BaseAgent:
+        """
+        Get a specialist agent, instantiating it on first use
+        
+        Args:
+            name: Agent name (key of AGENT_CLASSES)
             
-            comparison_info = ""
-            if params.intent == "Comparison":
-                comparison_info = f"\nComparison Order: {params.comparison_order_id or 'N/A'}"
-                if params.comparison_date:
-                    comparison_info += f"\nComparison Date: {params.comparison_date}"
+        Returns:
+            Shared agent instance
+        """
+        agent = self._agents.get(name)
+        if agent is None:
+            agent = self._agents[name] = self.AGENT_CLASSES[name]()
+        return agent
+    
+    @property
+    def agents(self) -> Dict[str, BaseAgent]:
+        """All specialist agents by name (instantiates any not yet created)"""
+        return {name: self.get_agent(name) for name in self.AGENT_CLASSES}
+    
+    def _query_cache_key(self, user_query: str) -> tuple[str, str]:
+        """
+        Cache key for parameters extracted from a query
+        
+        The supervisor model runs at temperature 0, so the same query yields
+        the same parameters. Relative and missing dates are resolved against
+        the current day during validation, so the day is part of the key.
+        """
+        return (DateHandler.get_current_date(), user_query)
+    
+    def _cached_parameters(self, cache_key: tuple[str, str]) -> Optional[QueryParameters]:
+        """Get cached parameters (LRU), or None on a miss"""
+        with self._query_cache_lock:
+            params = self._query_cache.get(cache_key)
+            if params is not None:
+                self._query_cache.move_to_end(cache_key)
+            return params
+    
+    def _cache_parameters(self, cache_key: tuple[str, str], params: QueryParameters) -> None:
+        """Remember extracted parameters, evicting the oldest over QUERY_CACHE_SIZE"""
+        with self._query_cache_lock:
+            self._query_cache[cache_key] = params
+            self._query_cache.move_to_end(cache_key)
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+    
+    def _analysis_updates(self, params: QueryParameters) -> Dict:
+        """
+        Build state updates from extracted parameters
+        
+        Args:
+            params: Parameters extracted by the LLM
             
-            ai_message = AIMessage(
-                content=f"""**[Supervisor Analysis]**
+        Returns:
+            Dict with parameters and the supervisor analysis message
+        """
+        # Ensure dates are properly set
+        params = params.ensure_dates_set()
+        
+        # Format date display
+        date_info = ""
+        if params.date:
+            date_info = f"\nDate: {params.date}"
+        
+        comparison_info = ""
+        if params.intent == "Comparison":
+            comparison_info = f"\nComparison Order: {params.comparison_order_id or 'N/A'}"
+            if params.comparison_date:
+                comparison_info += f"\nComparison Date: {params.comparison_date}"
+        
+        ai_message = AIMessage(
+            content=f"""**[Supervisor Analysis]**
 Intent: {params.intent}
 Order ID: {params.order_id or 'Not required'}{date_info}{comparison_info}
 Reasoning: {params.reasoning}""",
-                name=self.name
-            )
-            
-            # IMPORTANT: Only return updates, never return user_query
-            return {
-                "parameters": params,
-                "messages": [ai_message]
-            }
-            
+            name=self.name
+        )
+        
+        # IMPORTANT: Only return updates, never return user_query
+        return {
+            "parameters": params,
+            "messages": [ai_message]
+        }
+    
+    def _fallback_updates(self, error: Exception) -> Dict:
+        """Fallback - create parameters with empty order_id and current date"""
+        fallback_params = QueryParameters(
+            intent="Knowledge",
+            date=DateHandler.get_current_date(),
+            reasoning=f"Fallback due to error: {error}"
+        )
+        
+        # IMPORTANT: Only return updates
+        return {
+            "parameters": fallback_params,
+            "messages": []
+        }
+    
+    def analyze_query(self, state: Dict) -> Dict:
+        """Analyze query with structured output - handles date normalization"""
+        user_query = state['user_query']
+        cache_key = self._query_cache_key(user_query)
+        
+        # Cache lookups stay outside the fallback - only extraction
+        # failures fall back to the Knowledge intent
+        params = self._cached_parameters(cache_key)
+        if params is not None:
+            return self._analysis_updates(params)
+        
+        try:
+            params = self.llm.invoke(ANALYSIS_PROMPT_TEMPLATE.format(user_query=user_query))
+            updates = self._analysis_updates(params)
+        except Exception as e:
+            return self._fallback_updates(e)
+        
+        self._cache_parameters(cache_key, params)
+        return updates
+    
+    async def aanalyze_query(self, state: Dict) -> Dict:
+        """Async version of analyze_query"""
+        user_query = state['user_query']
+        cache_key = self._query_cache_key(user_query)
+        
+        params = self._cached_parameters(cache_key)
+        if params is not None:
+            return self._analysis_updates(params)
+        
+        try:
+            params = await self.llm.ainvoke(ANALYSIS_PROMPT_TEMPLATE.format(user_query=user_query))
+            updates = self._analysis_updates(params)
         except Exception as e:
-            # Fallback - create parameters with empty order_id and current date
-            from src.utils.date_handler import DateHandler
-            fallback_params = QueryParameters(
-                intent="Knowledge",
-                date=DateHandler.get_current_date(),
-                reasoning=f"Fallback due to error: {e}"
-            )
+            return self._fallback_updates(e)
+        
+        self._cache_parameters(cache_key, params)
+        return updates
+    
+    def analyze_given_parameters(self, state: Dict) -> Dict:
+        """
+        Supervisor analysis for parameters supplied by the caller - no LLM call
+        
+        Args:
+            state: State whose parameters were built from a structured request
             
-            # IMPORTANT: Only return updates
-            return {
-                "parameters": fallback_params,
-                "messages": []
-            }
+        Returns:
+            Dict with parameters and the supervisor analysis message
+        """
+        return self._analysis_updates(state["parameters"])
     
     def synthesize_findings(self, state: Dict) -> Dict:
         """
@@ -153,9 +266,8 @@ Reasoning: {params.reasoning}""",
     def _simple_synthesis(self, state: Dict) -> str:
         """Simple synthesis fallback"""
         findings = state.get("findings", {})
-        lines = []
-        for agent_name, data in findings.items():
-            if isinstance(data, dict):
-                summary = data.get("summary", data.get("analysis", ""))
-                lines.append(f"**{agent_name}:** {summary}")
-        return "\n\n".join(lines) if lines else "No findings available"
+        return "\n\n".join(
+            f"**{agent_name}:** {data.get('summary') or data.get('analysis', '')}"
+            for agent_name, data in findings.items()
+            if isinstance(data, dict)
+        ) or "No findings available"
@@ -0,0 +1,247 @@
+"""
+Test doubles for running the graph without LLMs, Oracle or Splunk
+
+The source files live flat in the repository but import each other as
+src.* packages. install_fake_modules() registers the real state module
+and fake supervisor/config modules under those names, so workflow.py
+can be imported and compiled as-is. load_database_agent() does the same
+for the Database Agent with a minimal BaseAgent, and load_run_agent()
+for the CLI.
+"""
+
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Dict, List
+import importlib.util
+import sys
+
+from langchain_core.messages import AIMessage
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+settings = SimpleNamespace(
+    enable_parallel_execution=False,
+    enable_caching=False
+)
+
+
+def make_params(intent: str, order_id: str = "", comparison_order_id: str = ""):
+    """Minimal stand-in for QueryParameters"""
+    return SimpleNamespace(
+        intent=intent,
+        order_id=order_id,
+        comparison_order_id=comparison_order_id,
+        date="",
+        comparison_date="",
+        reasoning="test"
+    )
+
+
+class FakeAgent:
+    """Agent that records its runs and returns canned state updates"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.calls: List[Dict] = []
+    
+    def _updates(self, state: Dict) -> Dict:
+        updates = {
+            "messages": [AIMessage(content=f"{self.name} done", name=self.name)],
+            "sender": self.name,
+            "investigation_step": state.get("investigation_step", 0) + 1
+        }
+        # Enrichment fields are phase-specific, like in the real agents
+        prefix = "comparison_" if state.get("current_investigation") == "comparison" else ""
+        if self.name == "Order_Enricher_Agent":
+            order_id = getattr(state["parameters"], f"{prefix}order_id")
+            updates.update({f"{prefix}aaa_order_id": order_id, f"{prefix}enrichment_flow": True})
+        elif self.name == "Database_Agent" and state.get(f"{prefix}enrichment_flow"):
+            updates.update({f"{prefix}actual_order_id": "ORD12345678", f"{prefix}enrichment_flow": False})
+        elif self.name == "Splunk_Agent":
+            updates["splunk_logs_found"] = True
+        return updates
+    
+    def execute(self, state: Dict) -> Dict:
+        self.calls.append(state)
+        return self._updates(state)
+    
+    async def aexecute(self, state: Dict) -> Dict:
+        return self.execute(state)
+
+
+class FakeSupervisor:
+    """SupervisorAgent stand-in - parameters come from FakeSupervisor.params"""
+    
+    AGENT_CLASSES = {
+        name: FakeAgent for name in (
+            "VectorDB_Agent",
+            "Splunk_Agent",
+            "Database_Agent",
+            "DebugAPI_Agent",
+            "Monitoring_Agent",
+            "Code_Agent",
+            "Comparison_Agent",
+            "Order_Enricher_Agent",
+            "Summarization_Agent"
+        )
+    }
+    
+    params = None
+    # Real agents to run instead of fakes, by name
+    agents: Dict[str, object] = {}
+    
+    def __init__(self):
+        self.name = "Supervisor"
+        self._agents = {}
+    
+    def get_agent(self, name: str) -> FakeAgent:
+        if name in FakeSupervisor.agents:
+            return FakeSupervisor.agents[name]
+        if name not in self._agents:
+            self._agents[name] = FakeAgent(name)
+        return self._agents[name]
+    
+    def analyze_query(self, state: Dict) -> Dict:
+        return {
+            "parameters": FakeSupervisor.params,
+            "messages": [AIMessage(content="analysis", name=self.name)]
+        }
+    
+    async def aanalyze_query(self, state: Dict) -> Dict:
+        return self.analyze_query(state)
+    
+    def analyze_given_parameters(self, state: Dict) -> Dict:
+        return {
+            "parameters": state["parameters"],
+            "messages": [AIMessage(content="analysis", name=self.name)]
+        }
+    
+    def synthesize_findings(self, state: Dict) -> Dict:
+        # Like the real supervisor, returns the whole state
+        state["final_answer"] = "report"
+        state["messages"].append(AIMessage(content="report", name=self.name))
+        return state
+
+
+class FakeBaseAgent:
+    """BaseAgent stand-in - runs the real _execute_tool, without LLM reflection"""
+    
+    ENRICHMENT_UPDATE_FIELDS = (
+        "aaa_order_id",
+        "enrichment_flow",
+        "actual_order_id",
+        "comparison_aaa_order_id",
+        "comparison_enrichment_flow",
+        "comparison_actual_order_id"
+    )
+    
+    def __init__(self, name: str, system_prompt: str):
+        self.name = name
+        self.system_prompt = system_prompt
+    
+    def _context(self, state: Dict) -> Dict:
+        params = state.get("parameters")
+        return {"order_id": state.get("actual_order_id") or getattr(params, "order_id", "")}
+    
+    def _updates(self, state: Dict, findings: Dict) -> Dict:
+        updates = {
+            "messages": [AIMessage(content=findings.get("summary", ""), name=self.name)],
+            "sender": self.name,
+            "investigation_step": state.get("investigation_step", 0) + 1
+        }
+        updates.update({key: findings[key] for key in self.ENRICHMENT_UPDATE_FIELDS if key in findings})
+        return updates
+    
+    def execute(self, state: Dict) -> Dict:
+        return self._updates(state, self._execute_tool(self._context(state), state))
+    
+    async def aexecute(self, state: Dict) -> Dict:
+        return self._updates(state, await self._aexecute_tool(self._context(state), state))
+
+
+class FakeDateHandler:
+    """DateHandler stand-in with a fixed current date"""
+    
+    @staticmethod
+    def get_current_date() -> str:
+        return "2025-01-15"
+    
+    @staticmethod
+    def normalize_date(value: str) -> str:
+        return value
+
+
+def _package(name: str) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is None:
+        module = sys.modules[name] = ModuleType(name)
+        module.__path__ = []
+    return module
+
+
+def _register(name: str, module: ModuleType) -> None:
+    parent, _, child = name.rpartition(".")
+    if parent:
+        _package(parent)
+        setattr(sys.modules[parent], child, module)
+    sys.modules[name] = module
+
+
+def _load_source(name: str, filename: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, REPO_ROOT / filename)
+    module = importlib.util.module_from_spec(spec)
+    _register(name, module)
+    spec.loader.exec_module(module)
+    return module
+
+
+def install_fake_modules() -> None:
+    """Register fake src.*/config modules and the real state module"""
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    
+    config_settings = ModuleType("config.settings")
+    config_settings.settings = settings
+    _register("config.settings", config_settings)
+    # Like config/__init__.py, expose the settings object on the package
+    _package("config").settings = settings
+    
+    supervisor_module = ModuleType("src.agents.supervisor_agent")
+    supervisor_module.SupervisorAgent = FakeSupervisor
+    _package("src.agents")
+    _register("src.agents.supervisor_agent", supervisor_module)
+    
+    _package("src.models")
+    _load_source("src.models.state", "state.py")
+
+
+def load_workflow() -> ModuleType:
+    """Import workflow.py against the fake modules, with a fresh graph cache"""
+    install_fake_modules()
+    import workflow
+    workflow.create_supervisor_graph.cache_clear()
+    return workflow
+
+
+def load_database_agent() -> ModuleType:
+    """Import database_agent.py against the fake modules, with empty caches"""
+    install_fake_modules()
+    base_module = ModuleType("src.agents.base_agent")
+    base_module.BaseAgent = FakeBaseAgent
+    _register("src.agents.base_agent", base_module)
+    import database_agent
+    database_agent.DatabaseAgent.clear_caches()
+    return database_agent
+
+
+def load_run_agent() -> ModuleType:
+    """Import run_agent.py against the fake graph and the real QueryParameters"""
+    _register("src.graph.workflow", load_workflow())
+    
+    date_handler_module = ModuleType("src.utils.date_handler")
+    date_handler_module.DateHandler = FakeDateHandler
+    _register("src.utils.date_handler", date_handler_module)
+    _load_source("src.models.query_parameters", "query_parameter.py")
+    
+    import run_agent
+    return run_agent
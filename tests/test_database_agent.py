@@ -0,0 +1,131 @@
+"""
+Tests for DatabaseAgent tool execution (simulated data, fake Oracle driver)
+"""
+
+from types import SimpleNamespace
+from unittest import mock
+import asyncio
+import unittest
+
+from fakes import load_database_agent, settings
+
+
+class FakeOracleError(Exception):
+    pass
+
+
+def failing_oracledb():
+    """oracledb stand-in whose pools can never be created"""
+    def create_pool(**kwargs):
+        raise FakeOracleError("ORA-12541: no listener")
+    return SimpleNamespace(Error=FakeOracleError, create_pool=create_pool)
+
+
+class DatabaseAgentExecuteToolTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.database_agent = load_database_agent()
+        self.database_agent._pool = None
+        self.database_agent._pool_failures.clear()
+        self.database_agent._async_pools.clear()
+        self.agent = self.database_agent.DatabaseAgent()
+    
+    def tearDown(self):
+        for name in ("oracle_dsn", "use_simulated_db"):
+            if hasattr(settings, name):
+                delattr(settings, name)
+    
+    def test_enrichment_mode_resolves_actual_order_id(self):
+        state = {
+            "current_investigation": "primary",
+            "enrichment_flow": True,
+            "aaa_order_id": "D12345678"
+        }
+        
+        result = self.agent._execute_tool({"order_id": ""}, state)
+        
+        self.assertEqual(result["actual_order_id"], "ORD12345678")
+        self.assertFalse(result["enrichment_flow"])
+        self.assertTrue(result["enrichment_completed"])
+    
+    def test_enrichment_mode_uses_comparison_fields(self):
+        state = {
+            "current_investigation": "comparison",
+            "comparison_enrichment_flow": True,
+            "comparison_aaa_order_id": "D87654321"
+        }
+        
+        result = self.agent._execute_tool({"order_id": ""}, state)
+        
+        self.assertEqual(result["comparison_actual_order_id"], "ORD87654321")
+        self.assertFalse(result["comparison_enrichment_flow"])
+    
+    def test_normal_mode_queries_trade_data(self):
+        state = {"current_investigation": "primary", "actual_order_id": "ORD100"}
+        
+        result = self.agent._execute_tool({"order_id": ""}, state)
+        
+        self.assertEqual(result["order_id"], "ORD100")
+        self.assertIn("| ORD100 |", result["raw_data"])
+        self.assertNotIn("error", result)
+    
+    def test_normal_mode_without_order_id_reports_error(self):
+        result = self.agent._execute_tool({"order_id": ""}, {"current_investigation": "primary"})
+        
+        self.assertEqual(result["error"], "Missing order_id")
+    
+    def test_unconfigured_oracle_uses_simulated_data(self):
+        with mock.patch.object(self.database_agent, "oracledb", failing_oracledb()):
+            result = self.agent._execute_tool({"order_id": "ORD200"}, {})
+        
+        self.assertIn("| ORD200 |", result["raw_data"])
+    
+    def test_unavailable_database_is_reported_not_simulated(self):
+        settings.oracle_dsn = "db.example:1521/PRICING"
+        
+        with mock.patch.object(self.database_agent, "oracledb", failing_oracledb()):
+            with self.assertLogs(self.database_agent.logger, "ERROR"):
+                result = self.agent._execute_tool({"order_id": "ORD300"}, {})
+        
+        self.assertIn("ORA-12541", result["error"])
+        self.assertNotIn("raw_data", result)
+
+    
+    def test_async_enrichment_and_trade_modes(self):
+        enrichment_state = {"enrichment_flow": True, "aaa_order_id": "D12345678"}
+        
+        enrichment = asyncio.run(self.agent._aexecute_tool({"order_id": ""}, enrichment_state))
+        trade = asyncio.run(self.agent._aexecute_tool({"order_id": "ORD400"}, {}))
+        
+        self.assertEqual(enrichment["actual_order_id"], "ORD12345678")
+        self.assertIn("| ORD400 |", trade["raw_data"])
+    
+    def test_async_pool_is_created_per_event_loop(self):
+        settings.oracle_dsn = "db.example:1521/PRICING"
+        driver = SimpleNamespace(Error=FakeOracleError, create_pool_async=lambda **kwargs: object())
+        
+        async def pool_twice():
+            return self.database_agent._get_async_pool(), self.database_agent._get_async_pool()
+        
+        with mock.patch.object(self.database_agent, "oracledb", driver):
+            first_a, first_b = asyncio.run(pool_twice())
+            second, _ = asyncio.run(pool_twice())
+        
+        self.assertIs(first_a, first_b)
+        self.assertIsNot(first_a, second)
+    
+    def test_async_trade_details_are_memoized(self):
+        fetch = mock.AsyncMock(return_value="| ORD500 |")
+        
+        async def query_twice():
+            return [await self.database_agent._aquery_order_details("ORD500") for _ in range(2)]
+        
+        with mock.patch.object(self.database_agent, "_afetch_order_details", fetch):
+            results = asyncio.run(query_twice())
+        
+        self.assertEqual(results, ["| ORD500 |", "| ORD500 |"])
+        fetch.assert_awaited_once_with("ORD500")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Tests for streaming graph events (agents are fakes)
+"""
+
+import asyncio
+import unittest
+
+from fakes import FakeSupervisor, load_workflow, make_params, settings
+from test_workflow import initial_state
+
+
+class StreamGraphEventsTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.workflow = load_workflow()
+        from event_stream import stream_graph_events
+        self.stream_graph_events = stream_graph_events
+        settings.enable_parallel_execution = True
+        FakeSupervisor.params = make_params("Investigation", order_id="ORD100")
+    
+    def tearDown(self):
+        settings.enable_parallel_execution = False
+    
+    def collect_events(self):
+        async def collect():
+            graph = self.workflow.create_supervisor_graph()
+            state = initial_state("Investigate order ORD100")
+            return [event async for event in self.stream_graph_events(graph, state)]
+        return asyncio.run(collect())
+    
+    def test_streams_messages_from_parallel_node(self):
+        events = self.collect_events()
+        
+        agents = [event["agent"] for event in events if event["type"] == "agent_message"]
+        self.assertEqual(
+            agents,
+            ["Supervisor", "Splunk_Agent", "Database_Agent", "Summarization_Agent", "Supervisor"]
+        )
+    
+    def test_complete_event_is_last(self):
+        events = self.collect_events()
+        
+        self.assertEqual(events[-1], {"type": "complete", "answer": "report"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+End-to-end batch mode test (real graph and Database Agent, DB helpers faked)
+"""
+
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+import tempfile
+import unittest
+
+from rich.console import Console
+
+from fakes import FakeSupervisor, load_database_agent, load_run_agent, make_params
+
+
+class BatchModeTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.database_agent = load_database_agent()
+        self.run_agent = load_run_agent()
+        FakeSupervisor.params = make_params("Investigation", order_id="D12345678")
+        FakeSupervisor.agents = {"Database_Agent": self.database_agent.DatabaseAgent()}
+        self.output = StringIO()
+    
+    def tearDown(self):
+        FakeSupervisor.agents = {}
+    
+    def run_batch(self, queries, concurrency: int = 2) -> str:
+        with tempfile.TemporaryDirectory() as tmp:
+            batch_file = Path(tmp) / "queries.txt"
+            batch_file.write_text("# batch\n" + "\n".join(queries) + "\n")
+            console = Console(file=self.output, width=200)
+            with mock.patch.object(self.run_agent, "console", console):
+                self.run_agent.run_batch_mode(str(batch_file), concurrency=concurrency)
+        return self.output.getvalue()
+    
+    def test_batch_queries_run_through_database_agent(self):
+        lookup = mock.AsyncMock(return_value={
+            "actual_order_id": "ORD12345678",
+            "aaa_order_id": "D12345678",
+            "lookup_status": "success"
+        })
+        queries = ["Investigate order D12345678", "Why did D12345678 fail?", "Check D12345678"]
+        
+        with mock.patch.object(self.database_agent, "_alookup_actual_order_id", lookup):
+            output = self.run_batch(queries)
+        
+        self.assertEqual(lookup.await_count, len(queries))
+        lookup.assert_awaited_with("D12345678")
+        self.assertIn("Success: 3", output)
+        self.assertIn("Failed: 0", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
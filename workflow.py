@@ -4,69 +4,415 @@ Includes: Order Enrichment, Date Handling, Comparison Flow, Proper State Managem
 """
 
 from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableLambda
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from src.agents.supervisor_agent import SupervisorAgent
 from src.models.state import AgentState
+from config import settings
+import asyncio
+import functools
+import logging
 
+logger = logging.getLogger(__name__)
 
+# Graph node name for each specialist agent
+NODE_NAMES = {
+    agent_name: agent_name.lower().replace("_", "")
+    for agent_name in SupervisorAgent.AGENT_CLASSES
+}
+
+# Routing decisions that depend on more than the last sender
+ROUTE_AFTER_DB = "route_after_db"
+ROUTE_TO_COMPARISON = "route_to_comparison"
+ROUTE_AFTER_SPLUNK = "route_after_splunk"
+
+# Primary enrichment fields and their values before any enrichment
+ENRICHMENT_DEFAULTS = (
+    ("aaa_order_id", None),
+    ("enrichment_flow", False),
+    ("actual_order_id", None),
+)
+
+# Intents whose order ID may need enrichment before investigation
+ENRICHMENT_INTENTS = frozenset({"Investigation", "Comparison", "Data"})
+
+# First agent for intents that do not depend on the order ID
+ENTRY_ROUTES = {
+    "Knowledge": "vectordbagent",
+    "Data": "splunkagent",
+    "Monitoring": "monitoringagent",
+}
+
+# Conditional-edge destinations after an agent node (shared by every agent)
+AGENT_EDGE_MAP = {
+    "splunkagent": "splunkagent",
+    "databaseagent": "databaseagent",
+    "debugapiagent": "debugapiagent",
+    "codeagent": "codeagent",
+    "comparisonagent": "comparisonagent",
+    "orderenricheragent": "orderenricheragent",
+    "summarizationagent": "summarizationagent",
+    "synthesize": "synthesize",
+    "switch_to_comparison": "switch_to_comparison",
+    "switch_to_comparison_enricher": "switch_to_comparison_enricher"
+}
+
+# Conditional-edge destinations after the Database Agent
+DB_EDGE_MAP = {
+    "splunkagent": "splunkagent",
+    "databaseagent": "databaseagent",
+    "debugapiagent": "debugapiagent",
+    "codeagent": "codeagent",
+    "comparisonagent": "comparisonagent",
+    "summarizationagent": "summarizationagent",
+    "synthesize": "synthesize",
+    "parallelinvestigation": "parallelinvestigation",
+    "switch_to_comparison": "switch_to_comparison",
+    "switch_to_comparison_enricher": "switch_to_comparison_enricher"
+}
+
+# Next node by (intent, comparison phase, last agent) - phase is None
+# outside comparisons. Unlisted combinations go to summarization.
+ROUTES = {
+    # Comparison - primary order
+    ("Comparison", "primary", "Splunk_Agent"): ROUTE_TO_COMPARISON,
+    ("Comparison", "primary", "Order_Enricher_Agent"): "databaseagent",
+    ("Comparison", "primary", "Database_Agent"): ROUTE_AFTER_DB,
+    ("Comparison", "primary", "DebugAPI_Agent"): ROUTE_TO_COMPARISON,
+    # Comparison - comparison order, then compare both
+    ("Comparison", "comparison", "Splunk_Agent"): "comparisonagent",
+    ("Comparison", "comparison", "Order_Enricher_Agent"): "databaseagent",
+    ("Comparison", "comparison", "Database_Agent"): ROUTE_AFTER_DB,
+    ("Comparison", "comparison", "DebugAPI_Agent"): "comparisonagent",
+    # Code analysis
+    ("CodeAnalysis", None, "Database_Agent"): "codeagent",
+    # Single-order investigation
+    ("Investigation", None, "Order_Enricher_Agent"): "databaseagent",
+    ("Investigation", None, "Splunk_Agent"): ROUTE_AFTER_SPLUNK,
+    ("Investigation", None, "Database_Agent"): ROUTE_AFTER_DB,
+    ("Investigation", None, "DebugAPI_Agent"): "summarizationagent",
+}
+
+
+def needs_enrichment(order_id):
+    """Check if order ID needs enrichment (D-prefix with 9 chars after removing dots)"""
+    if not order_id:
+        return False
+    # Count dots instead of building a dot-free copy of the ID
+    return (
+        len(order_id) - order_id.count(".") == 9
+        and order_id.lstrip(".").startswith("D")
+    )
+
+
+def merge_agent_updates(*updates: dict) -> dict:
+    """
+    Merge state updates from agents that ran concurrently
+    
+    Messages and errors are concatenated in the given order,
+    other fields take the last agent's value. Every agent that ran is
+    recorded in recent_agents.
+    """
+    merged = {"messages": [], "error_log": []}
+    for update in updates:
+        for key, value in update.items():
+            if key in ("messages", "error_log"):
+                merged[key] += list(value)
+            else:
+                merged[key] = value
+    merged["recent_agents"] = [update["sender"] for update in updates if "sender" in update]
+    return merged
+
+
+def run_agent_node(supervisor: SupervisorAgent, agent_name: str, state: dict) -> dict:
+    """Graph node body: run one specialist agent (sync graph execution)"""
+    result = supervisor.get_agent(agent_name).execute(state)
+    # DON'T increment investigation_step here - it causes double increment
+    # Just pass through the result
+    result["recent_agents"] = [result["sender"]]
+    return result
+
+
+async def arun_agent_node(supervisor: SupervisorAgent, agent_name: str, state: dict) -> dict:
+    """Graph node body: run one specialist agent (async graph execution)"""
+    result = await supervisor.get_agent(agent_name).aexecute(state)
+    result["recent_agents"] = [result["sender"]]
+    return result
+
+
+def comparison_branch_states(state: dict) -> tuple[dict, dict]:
+    """Primary and comparison views of the state sharing the findings dicts"""
+    # Agents write findings in place - make sure both dicts exist first
+    state.setdefault("findings", {})
+    state.setdefault("comparison_findings", {})
+    return (
+        {**state, "current_investigation": "primary"},
+        {**state, "current_investigation": "comparison"}
+    )
+
+
+def next_comparison_agent(state: dict, sender: Optional[str]) -> Optional[str]:
+    """
+    Next agent when one order of a comparison is investigated on its own
+    
+    Follows the serial comparison flow for a single phase: enrichment
+    (Order Enricher, then the Database lookup) when the order needs it,
+    then Splunk - or DebugAPI when enrichment did not resolve the order.
+    
+    Args:
+        state: Branch state for the phase being investigated
+        sender: Agent that just ran, or None before the first agent
+        
+    Returns:
+        Agent name, or None when the order is fully investigated
+    """
+    phase = state.get("current_investigation", "primary")
+    prefix = "comparison_" if phase == "comparison" else ""
+    
+    if sender is None:
+        order_id = getattr(state.get("parameters"), f"{prefix}order_id", None)
+        return "Order_Enricher_Agent" if needs_enrichment(order_id) else "Splunk_Agent"
+    if sender == "Order_Enricher_Agent":
+        return "Database_Agent"
+    if sender == "Database_Agent":
+        enrichment_completed = state.get(f"{prefix}actual_order_id") is not None
+        enrichment_active = state.get(f"{prefix}enrichment_flow", False)
+        return "Splunk_Agent" if enrichment_completed and not enrichment_active else "DebugAPI_Agent"
+    return None
+
+
+def apply_branch_update(state: dict, update: dict) -> None:
+    """Apply an agent's update to a branch state (messages and errors are merged later)"""
+    state.update(
+        (key, value) for key, value in update.items()
+        if key not in ("messages", "error_log")
+    )
+
+
+def investigate_comparison_order(supervisor: SupervisorAgent, state: dict) -> list[dict]:
+    """
+    Investigate one order of a comparison (sync)
+    
+    Args:
+        supervisor: Supervisor holding the specialist agents
+        state: Branch state from comparison_branch_states
+        
+    Returns:
+        Updates of the agents that ran, in order
+    """
+    updates = []
+    agent_name = next_comparison_agent(state, None)
+    while agent_name:
+        update = supervisor.get_agent(agent_name).execute(state)
+        apply_branch_update(state, update)
+        updates.append(update)
+        agent_name = next_comparison_agent(state, agent_name)
+    return updates
+
+
+async def ainvestigate_comparison_order(supervisor: SupervisorAgent, state: dict) -> list[dict]:
+    """Async version of investigate_comparison_order"""
+    updates = []
+    agent_name = next_comparison_agent(state, None)
+    while agent_name:
+        update = await supervisor.get_agent(agent_name).aexecute(state)
+        apply_branch_update(state, update)
+        updates.append(update)
+        agent_name = next_comparison_agent(state, agent_name)
+    return updates
+
+
+def investigate_both_orders(supervisor: SupervisorAgent, state: dict) -> dict:
+    """Graph node body: investigate both orders concurrently (sync graph execution)"""
+    logger.debug("[PARALLEL] Primary + Comparison order investigations")
+    primary_state, comparison_state = comparison_branch_states(state)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        primary_future = executor.submit(investigate_comparison_order, supervisor, primary_state)
+        comparison_future = executor.submit(investigate_comparison_order, supervisor, comparison_state)
+        updates = merge_agent_updates(*primary_future.result(), *comparison_future.result())
+    updates["current_investigation"] = "comparison"
+    return updates
+
+
+async def ainvestigate_both_orders(supervisor: SupervisorAgent, state: dict) -> dict:
+    """Graph node body: investigate both orders concurrently (async graph execution)"""
+    logger.debug("[PARALLEL] Primary + Comparison order investigations")
+    primary_state, comparison_state = comparison_branch_states(state)
+    primary_updates, comparison_updates = await asyncio.gather(
+        ainvestigate_comparison_order(supervisor, primary_state),
+        ainvestigate_comparison_order(supervisor, comparison_state)
+    )
+    updates = merge_agent_updates(*primary_updates, *comparison_updates)
+    updates["current_investigation"] = "comparison"
+    return updates
+
+
+@functools.lru_cache(maxsize=1)
+def get_supervisor() -> SupervisorAgent:
+    """Supervisor shared by all graphs, so they reuse the same agents"""
+    return SupervisorAgent()
+
+
+@functools.lru_cache(maxsize=1)
+def create_comparison_graph():
+    """
+    Create the workflow for comparing two known orders
+    
+    Used when the caller already has both order IDs (e.g. the /compare
+    endpoint): the parameters in the initial state are used as-is instead
+    of being extracted by the supervisor LLM. Both orders are investigated
+    concurrently, then compared, summarized and synthesized once - the
+    same steps that end the serial comparison flow.
+    
+    Built once per process - repeated calls return the same compiled graph
+    """
+    supervisor = get_supervisor()
+    workflow = StateGraph(AgentState)
+    
+    workflow.add_node("supervisor", supervisor.analyze_given_parameters)
+    workflow.add_node("investigateorders", RunnableLambda(
+        functools.partial(investigate_both_orders, supervisor),
+        afunc=functools.partial(ainvestigate_both_orders, supervisor)
+    ))
+    for agent_name in ("Comparison_Agent", "Summarization_Agent"):
+        workflow.add_node(NODE_NAMES[agent_name], RunnableLambda(
+            functools.partial(run_agent_node, supervisor, agent_name),
+            afunc=functools.partial(arun_agent_node, supervisor, agent_name)
+        ))
+    workflow.add_node("synthesize", supervisor.synthesize_findings)
+    
+    workflow.set_entry_point("supervisor")
+    workflow.add_edge("supervisor", "investigateorders")
+    workflow.add_edge("investigateorders", "comparisonagent")
+    workflow.add_edge("comparisonagent", "summarizationagent")
+    workflow.add_edge("summarizationagent", "synthesize")
+    workflow.add_edge("synthesize", END)
+    
+    return workflow.compile()
+
+
+@functools.lru_cache(maxsize=1)
 def create_supervisor_graph():
-    """Create optimized multi-agent workflow with all fixes"""
+    """
+    Create optimized multi-agent workflow with all fixes
+    
+    Built once per process - repeated calls return the same compiled graph
+    """
     
-    supervisor = SupervisorAgent()
+    supervisor = get_supervisor()
     workflow = StateGraph(AgentState)
     
     # Add supervisor and synthesis nodes
-    workflow.add_node("supervisor", lambda s: supervisor.analyze_query(s))
-    workflow.add_node("synthesize", lambda s: supervisor.synthesize_findings(s))
+    workflow.add_node(
+        "supervisor",
+        RunnableLambda(supervisor.analyze_query, afunc=supervisor.aanalyze_query)
+    )
+    workflow.add_node("synthesize", supervisor.synthesize_findings)
     
     # Add transition nodes for comparison flow
     def switch_to_comparison(state):
         """Transition node: Switch from primary to comparison investigation"""
-        print("[TRANSITION] Switching to comparison phase")
-        # Only return fields that need updating - NEVER include user_query
+        logger.debug("[TRANSITION] Switching to comparison phase")
+        # Only return fields that need updating - NEVER include user_query.
+        # Messages are left out: the operator.add reducer would append the
+        # whole history again.
         return {
             "current_investigation": "comparison",
-            "investigation_step": 0,
-            "messages": state["messages"]  # Pass through
-        }
-    
-    def switch_to_comparison_enricher(state):
-        """Transition node: Switch to comparison and prepare for enrichment"""
-        print("[TRANSITION] Switching to comparison phase (with enrichment)")
-        # Only return fields that need updating - NEVER include user_query
-        return {
-            "current_investigation": "comparison",
-            "investigation_step": 0,
-            "messages": state["messages"]  # Pass through
+            "investigation_step": 0
         }
     
+    # Both transitions make the same update, only their next agent differs
     workflow.add_node("switch_to_comparison", switch_to_comparison)
-    workflow.add_node("switch_to_comparison_enricher", switch_to_comparison_enricher)
+    workflow.add_node("switch_to_comparison_enricher", switch_to_comparison)
     
     # Transition nodes always route to next agent
     workflow.add_edge("switch_to_comparison", "splunkagent")
     workflow.add_edge("switch_to_comparison_enricher", "orderenricheragent")
     
     # Add all agent nodes dynamically
-    for agent_name, agent_instance in supervisor.agents.items():
-        node_name = agent_name.lower().replace("_", "")
-        
-        def make_node(agent):
-            def node(state):
-                result = agent.execute(state)
-                # DON'T increment investigation_step here - it causes double increment
-                # Just pass through the result
-                return result
-            return node
-        
-        workflow.add_node(node_name, make_node(agent_instance))
+    # Agents are instantiated by the supervisor on first use
+    for agent_name, node_name in NODE_NAMES.items():
+        workflow.add_node(node_name, RunnableLambda(
+            functools.partial(run_agent_node, supervisor, agent_name),
+            afunc=functools.partial(arun_agent_node, supervisor, agent_name)
+        ))
+    
+    # Parallel investigation node: Splunk logs and DB trade data only depend
+    # on the (enriched) order ID, so fetch them concurrently
+    def parallel_investigation(state):
+        """Run Splunk and Database agents concurrently (sync graph execution)"""
+        logger.debug("[PARALLEL] Splunk + Database")
+        splunk_agent = supervisor.get_agent("Splunk_Agent")
+        database_agent = supervisor.get_agent("Database_Agent")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            splunk_future = executor.submit(splunk_agent.execute, state)
+            db_future = executor.submit(database_agent.execute, state)
+            return merge_agent_updates(splunk_future.result(), db_future.result())
+    
+    async def aparallel_investigation(state):
+        """Run Splunk and Database agents concurrently (async graph execution)"""
+        logger.debug("[PARALLEL] Splunk + Database")
+        splunk_agent = supervisor.get_agent("Splunk_Agent")
+        database_agent = supervisor.get_agent("Database_Agent")
+        splunk_result, db_result = await asyncio.gather(
+            splunk_agent.aexecute(state),
+            database_agent.aexecute(state)
+        )
+        return merge_agent_updates(splunk_result, db_result)
+    
+    workflow.add_node(
+        "parallelinvestigation",
+        RunnableLambda(parallel_investigation, afunc=aparallel_investigation)
+    )
+    
+    def route_after_parallel(state):
+        """Trade data is already fetched - DebugAPI only needed when no logs"""
+        if state.get("splunk_logs_found", False):
+            logger.debug("[PARALLEL] → summarizationagent (logs found)")
+            return "summarizationagent"
+        logger.debug("[PARALLEL] → debugapiagent (no logs, trade fields fetched)")
+        return "debugapiagent"
+    
+    workflow.add_conditional_edges("parallelinvestigation", route_after_parallel, {
+        "summarizationagent": "summarizationagent",
+        "debugapiagent": "debugapiagent"
+    })
     
-    # Helper function to check if order needs enrichment
-    def needs_enrichment(order_id):
-        """Check if order ID needs enrichment (D-prefix with 9 chars after removing dots)"""
-        if not order_id:
-            return False
-        clean_id = order_id.replace(".", "")
-        return clean_id.startswith("D") and len(clean_id) == 9
+    # Parallel comparison node: without enrichment, each order only needs a
+    # Splunk search, and the two orders are independent
+    def parallel_comparison(state):
+        """Investigate both orders concurrently (sync graph execution)"""
+        logger.debug("[PARALLEL] Primary + Comparison Splunk")
+        splunk_agent = supervisor.get_agent("Splunk_Agent")
+        primary_state, comparison_state = comparison_branch_states(state)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            primary_future = executor.submit(splunk_agent.execute, primary_state)
+            comparison_future = executor.submit(splunk_agent.execute, comparison_state)
+            updates = merge_agent_updates(primary_future.result(), comparison_future.result())
+        updates["current_investigation"] = "comparison"
+        return updates
+    
+    async def aparallel_comparison(state):
+        """Investigate both orders concurrently (async graph execution)"""
+        logger.debug("[PARALLEL] Primary + Comparison Splunk")
+        splunk_agent = supervisor.get_agent("Splunk_Agent")
+        primary_state, comparison_state = comparison_branch_states(state)
+        primary_result, comparison_result = await asyncio.gather(
+            splunk_agent.aexecute(primary_state),
+            splunk_agent.aexecute(comparison_state)
+        )
+        updates = merge_agent_updates(primary_result, comparison_result)
+        updates["current_investigation"] = "comparison"
+        return updates
+    
+    workflow.add_node(
+        "parallelcomparison",
+        RunnableLambda(parallel_comparison, afunc=aparallel_comparison)
+    )
+    
+    # Both orders investigated - compare them
+    workflow.add_edge("parallelcomparison", "comparisonagent")
     
     # Routing functions
     def route_from_supervisor(state):
@@ -76,243 +422,108 @@ def create_supervisor_graph():
             return "synthesize"
         
         intent = params.intent
-        order_id = params.order_id if hasattr(params, 'order_id') else None
+        order_id = getattr(params, 'order_id', None)
         
         # Initialize enrichment fields to ensure they exist
-        if "aaa_order_id" not in state:
-            state["aaa_order_id"] = None
-        if "enrichment_flow" not in state:
-            state["enrichment_flow"] = False
-        if "actual_order_id" not in state:
-            state["actual_order_id"] = None
+        for key, default in ENRICHMENT_DEFAULTS:
+            state.setdefault(key, default)
         
         # Check if order enrichment is needed
-        if intent in ["Investigation", "Comparison", "Data"]:
-            if order_id and needs_enrichment(order_id):
-                # Order needs enrichment - route to Order Enricher
-                return "orderenricheragent"
-            else:
-                # Order doesn't need enrichment
-                pass  # Continue to normal routing
+        if intent in ENRICHMENT_INTENTS and needs_enrichment(order_id):
+            # Order needs enrichment - route to Order Enricher
+            return "orderenricheragent"
         
-        # Normal routing
-        if intent == "Knowledge":
-            return "vectordbagent"
-        elif intent == "Data":
-            return "splunkagent"
-        elif intent == "Monitoring":
-            return "monitoringagent"
-        elif intent == "CodeAnalysis":
+        # Normal routing - single-agent intents go straight to their agent
+        entry = ENTRY_ROUTES.get(intent)
+        if entry:
+            return entry
+        if intent == "CodeAnalysis":
             return "codeagent" if not order_id else "databaseagent"
-        elif intent in ["Investigation", "Comparison"]:
-            return "splunkagent"
+        if getattr(settings, "enable_parallel_execution", False):
+            if intent == "Investigation":
+                return "parallelinvestigation"
+            if intent == "Comparison":
+                comparison_order = getattr(params, 'comparison_order_id', None)
+                if comparison_order and not needs_enrichment(comparison_order):
+                    return "parallelcomparison"
         return "splunkagent"
     
     def route_after_enrichment_db(state):
         """Route after DB Agent completes enrichment - continue to Splunk"""
         return "splunkagent"
     
+    def route_after_db(state, phase):
+        """Next agent after a Database Agent run (trade data or enrichment lookup)"""
+        if phase == "comparison":
+            enrichment_completed = state.get("comparison_actual_order_id") is not None
+            enrichment_active = state.get("comparison_enrichment_flow", False)
+        else:
+            enrichment_completed = state.get("actual_order_id") is not None
+            enrichment_active = state.get("enrichment_flow", False)
+        
+        # Agents that ran most recently (kept by the recent_agents reducer)
+        recent_agents = state.get("recent_agents", [])
+        logger.debug(
+            "[ROUTING] DB Agent - enrichment_completed: %s, enrichment_active: %s, recent agents: %s",
+            enrichment_completed, enrichment_active, recent_agents
+        )
+        
+        # If Splunk was called before this DB call, we're getting trade fields
+        if "Splunk_Agent" in recent_agents:
+            return "debugapiagent"
+        if enrichment_completed and not enrichment_active:
+            # Enrichment lookup done - investigate the actual order
+            params = state.get("parameters")
+            if getattr(settings, "enable_parallel_execution", False) and params and params.intent == "Investigation":
+                return "parallelinvestigation"
+            return "splunkagent"
+        return "debugapiagent"
+    
+    def route_to_comparison(state):
+        """Switch from the primary to the comparison investigation"""
+        params = state.get("parameters")
+        comparison_order = getattr(params, 'comparison_order_id', None)
+        if comparison_order and needs_enrichment(comparison_order):
+            return "switch_to_comparison_enricher"
+        return "switch_to_comparison"
+    
+    def route_after_splunk(state):
+        """Single-order investigation: DB trade fields are only needed without logs"""
+        if state.get("splunk_logs_found", False):
+            return "summarizationagent"
+        return "databaseagent"
+    
     def route_next_agent(state):
         """
         Pure routing function - determines next agent
-        IMPORTANT: Use messages to determine last agent, not sender field (which may not be updated yet)
-        """
-        # Get the ACTUAL last agent from messages (more reliable than sender field)
-        messages = state.get("messages", [])
-        sender = None
-        for msg in reversed(messages):
-            if hasattr(msg, 'name') and msg.name and msg.name != "Supervisor":
-                sender = msg.name
-                break
         
-        if not sender:
-            sender = state.get("sender", "")
+        Looks up (intent, phase, sender) in ROUTES. Anything not listed
+        goes to the Summarization Agent.
+        """
+        sender = state.get("sender", "")
         
         params = state.get("parameters")
         intent = params.intent if params else "Investigation"
-        current_inv = state.get("current_investigation", "primary")
-        step = state.get("investigation_step", 0)
-        
-        # DEBUG LOGGING
-        print(f"\n{'='*60}")
-        print(f"[ROUTING] Step {step}")
-        print(f"  Sender (from messages): {sender}")
-        print(f"  Intent: {intent}")
-        print(f"  Investigation Phase: {current_inv}")
-        print(f"  Enrichment Flow: {state.get('enrichment_flow', False)}")
-        print(f"  Actual Order ID: {state.get('actual_order_id')}")
-        print(f"{'='*60}")
+        # Only comparisons have a second investigation phase
+        phase = state.get("current_investigation", "primary") if intent == "Comparison" else None
         
         # If Summarization Agent just ran, go to synthesis
         if sender == "Summarization_Agent":
-            print(f"[ROUTING] → synthesize (from Summarization Agent)")
-            return "synthesize"
-        
-        # Single agent paths
-        if intent in ["Knowledge", "Data", "Monitoring"]:
-            print(f"[ROUTING] → summarizationagent (simple intent)")
-            return "summarizationagent"
-        
-        # Code analysis
-        if intent == "CodeAnalysis":
-            if sender == "Database_Agent":
-                print(f"[ROUTING] → codeagent")
-                return "codeagent"
-            elif sender == "Code_Agent":
-                print(f"[ROUTING] → summarizationagent")
-                return "summarizationagent"
-            print(f"[ROUTING] → summarizationagent (fallback)")
-            return "summarizationagent"
-        
-        # COMPARISON FLOW
-        if intent == "Comparison":
-            print(f"\n[COMPARISON FLOW] Phase: {current_inv}, Sender: {sender}")
-            
-            if current_inv == "primary":
-                print(f"[PRIMARY INVESTIGATION]")
-                
-                if sender == "Splunk_Agent":
-                    print(f"[PRIMARY] Splunk completed - switch to comparison phase")
-                    comparison_order = params.comparison_order_id if hasattr(params, 'comparison_order_id') else None
-                    print(f"[PRIMARY] Comparison order: {comparison_order}")
-                    
-                    if comparison_order and needs_enrichment(comparison_order):
-                        print(f"[PRIMARY] → switch_to_comparison_enricher")
-                        return "switch_to_comparison_enricher"
-                    
-                    print(f"[PRIMARY] → switch_to_comparison")
-                    return "switch_to_comparison"
-                
-                elif sender == "Order_Enricher_Agent":
-                    print(f"[PRIMARY] → databaseagent (after Order Enricher)")
-                    return "databaseagent"
-                
-                elif sender == "Database_Agent":
-                    enrichment_completed = state.get("actual_order_id") is not None
-                    enrichment_active = state.get("enrichment_flow", False)
-                    
-                    print(f"[PRIMARY] DB Agent - enrichment_completed: {enrichment_completed}, enrichment_active: {enrichment_active}")
-                    
-                    # Check message history to determine context
-                    messages = state.get("messages", [])
-                    recent_agents = [msg.name for msg in messages[-5:] if hasattr(msg, 'name')]
-                    print(f"[PRIMARY] Recent agents: {recent_agents}")
-                    
-                    if "Splunk_Agent" in recent_agents:
-                        print(f"[PRIMARY] → debugapiagent (DB called after Splunk for trade fields)")
-                        return "debugapiagent"
-                    elif enrichment_completed and not enrichment_active:
-                        print(f"[PRIMARY] → splunkagent (after enrichment)")
-                        return "splunkagent"
-                    else:
-                        print(f"[PRIMARY] → debugapiagent (fallback)")
-                        return "debugapiagent"
-                
-                elif sender == "DebugAPI_Agent":
-                    print(f"[PRIMARY] DebugAPI completed - switch to comparison phase")
-                    comparison_order = params.comparison_order_id if hasattr(params, 'comparison_order_id') else None
-                    
-                    if comparison_order and needs_enrichment(comparison_order):
-                        print(f"[PRIMARY] → switch_to_comparison_enricher")
-                        return "switch_to_comparison_enricher"
-                    
-                    print(f"[PRIMARY] → switch_to_comparison")
-                    return "switch_to_comparison"
-            
-            elif current_inv == "comparison":
-                print(f"[COMPARISON INVESTIGATION]")
-                
-                if sender == "Splunk_Agent":
-                    comparison_splunk = state.get("comparison_findings", {}).get("Splunk_Agent", {})
-                    logs_found = comparison_splunk.get("logs_found", False)
-                    
-                    print(f"[COMPARISON] Splunk completed - logs_found: {logs_found}")
-                    print(f"[COMPARISON] → comparisonagent (both orders investigated)")
-                    return "comparisonagent"
-                
-                elif sender == "Order_Enricher_Agent":
-                    print(f"[COMPARISON] → databaseagent (after Order Enricher)")
-                    return "databaseagent"
-                
-                elif sender == "Database_Agent":
-                    enrichment_completed = state.get("comparison_actual_order_id") is not None
-                    enrichment_active = state.get("comparison_enrichment_flow", False)
-                    
-                    print(f"[COMPARISON] DB Agent - enrichment_completed: {enrichment_completed}, enrichment_active: {enrichment_active}")
-                    
-                    # Check message history
-                    messages = state.get("messages", [])
-                    recent_agents = [msg.name for msg in messages[-5:] if hasattr(msg, 'name')]
-                    print(f"[COMPARISON] Recent agents: {recent_agents}")
-                    
-                    if "Splunk_Agent" in recent_agents:
-                        print(f"[COMPARISON] → debugapiagent (DB called after Splunk for trade fields)")
-                        return "debugapiagent"
-                    elif enrichment_completed and not enrichment_active:
-                        print(f"[COMPARISON] → splunkagent (after enrichment)")
-                        return "splunkagent"
-                    else:
-                        print(f"[COMPARISON] → debugapiagent (fallback)")
-                        return "debugapiagent"
-                
-                elif sender == "DebugAPI_Agent":
-                    print(f"[COMPARISON] DebugAPI completed")
-                    print(f"[COMPARISON] → comparisonagent (both orders investigated)")
-                    return "comparisonagent"
-            
-            if sender == "Comparison_Agent":
-                print(f"[ROUTING] → summarizationagent (after Comparison Agent)")
-                return "summarizationagent"
-        
-        # INVESTIGATION FLOW (single order)
-        if intent == "Investigation":
-            print(f"\n[INVESTIGATION FLOW] Sender: {sender}")
-            
-            if sender == "Order_Enricher_Agent":
-                print(f"[INVESTIGATION] → databaseagent (after Order Enricher)")
-                return "databaseagent"
-            
-            elif sender == "Splunk_Agent":
-                splunk_findings = state.get("findings", {}).get("Splunk_Agent", {})
-                logs_found = splunk_findings.get("logs_found", False)
-                
-                print(f"[INVESTIGATION] Splunk logs_found: {logs_found}")
-                
-                if logs_found:
-                    print(f"[INVESTIGATION] → summarizationagent (logs found)")
-                    return "summarizationagent"
-                else:
-                    print(f"[INVESTIGATION] → databaseagent (no logs, need trade fields)")
-                    return "databaseagent"
-            
-            elif sender == "Database_Agent":
-                enrichment_completed = state.get("actual_order_id") is not None
-                enrichment_active = state.get("enrichment_flow", False)
-                
-                print(f"[INVESTIGATION] DB Agent - enrichment_completed: {enrichment_completed}, enrichment_active: {enrichment_active}")
-                
-                # Check message history to determine context
-                messages = state.get("messages", [])
-                recent_agents = [msg.name for msg in messages[-5:] if hasattr(msg, 'name')]
-                print(f"[INVESTIGATION] Recent agents: {recent_agents}")
-                
-                # If Splunk was called before this DB call, we're getting trade fields
-                if "Splunk_Agent" in recent_agents:
-                    print(f"[INVESTIGATION] → debugapiagent (DB called after Splunk for trade fields)")
-                    return "debugapiagent"
-                elif enrichment_completed and not enrichment_active:
-                    print(f"[INVESTIGATION] → splunkagent (after enrichment)")
-                    return "splunkagent"
-                else:
-                    print(f"[INVESTIGATION] → debugapiagent (fallback)")
-                    return "debugapiagent"
-            
-            elif sender == "DebugAPI_Agent":
-                print(f"[INVESTIGATION] → summarizationagent")
-                return "summarizationagent"
+            next_node = "synthesize"
+        else:
+            next_node = ROUTES.get((intent, phase, sender), "summarizationagent")
+            if next_node == ROUTE_AFTER_DB:
+                next_node = route_after_db(state, phase)
+            elif next_node == ROUTE_TO_COMPARISON:
+                next_node = route_to_comparison(state)
+            elif next_node == ROUTE_AFTER_SPLUNK:
+                next_node = route_after_splunk(state)
         
-        print(f"[ROUTING] → summarizationagent (fallback)")
-        return "summarizationagent"
+        logger.debug(
+            "[ROUTING] step=%s sender=%s intent=%s phase=%s → %s",
+            state.get("investigation_step", 0), sender, intent, phase, next_node
+        )
+        return next_node
     
     # Set entry point
     workflow.set_entry_point("supervisor")
@@ -326,67 +537,32 @@ def create_supervisor_graph():
         "monitoringagent": "monitoringagent",
         "codeagent": "codeagent",
         "orderenricheragent": "orderenricheragent",
+        "parallelinvestigation": "parallelinvestigation",
+        "parallelcomparison": "parallelcomparison",
         "synthesize": "synthesize"
     })
     
     # All agents route through the same logic
-    for agent_name in supervisor.agents.keys():
-        node_name = agent_name.lower().replace("_", "")
-        
+    for node_name in NODE_NAMES.values():
         # Special handling for Database Agent when coming from Order Enricher
         if node_name == "databaseagent":
             def db_router(state):
-                # Get the ACTUAL last agent from messages (more reliable than sender field)
-                messages = state.get("messages", [])
-                sender = None
-                for msg in reversed(messages):
-                    if hasattr(msg, 'name') and msg.name and msg.name != "Supervisor":
-                        sender = msg.name
-                        break
+                sender = state.get("sender", "")
                 
-                print(f"\n[DB_ROUTER] Last agent from messages: {sender}")
+                logger.debug("[DB_ROUTER] Last agent: %s", sender)
                 
                 # Check if DB was called right after Order Enricher
                 if sender == "Order_Enricher_Agent":
-                    print(f"[DB_ROUTER] → splunkagent (after enrichment)")
+                    logger.debug("[DB_ROUTER] → splunkagent (after enrichment)")
                     return "splunkagent"
                 
                 # For all other cases, use normal routing logic
-                print(f"[DB_ROUTER] → route_next_agent (normal flow)")
+                logger.debug("[DB_ROUTER] → route_next_agent (normal flow)")
                 return route_next_agent(state)
             
-            workflow.add_conditional_edges(
-                node_name,
-                db_router,
-                {
-                    "splunkagent": "splunkagent",
-                    "databaseagent": "databaseagent",
-                    "debugapiagent": "debugapiagent",
-                    "codeagent": "codeagent",
-                    "comparisonagent": "comparisonagent",
-                    "summarizationagent": "summarizationagent",
-                    "synthesize": "synthesize",
-                    "switch_to_comparison": "switch_to_comparison",
-                    "switch_to_comparison_enricher": "switch_to_comparison_enricher"
-                }
-            )
+            workflow.add_conditional_edges(node_name, db_router, DB_EDGE_MAP)
         else:
-            workflow.add_conditional_edges(
-                node_name,
-                route_next_agent,
-                {
-                    "splunkagent": "splunkagent",
-                    "databaseagent": "databaseagent",
-                    "debugapiagent": "debugapiagent",
-                    "codeagent": "codeagent",
-                    "comparisonagent": "comparisonagent",
-                    "orderenricheragent": "orderenricheragent",
-                    "summarizationagent": "summarizationagent",
-                    "synthesize": "synthesize",
-                    "switch_to_comparison": "switch_to_comparison",
-                    "switch_to_comparison_enricher": "switch_to_comparison_enricher"
-                }
-            )
+            workflow.add_conditional_edges(node_name, route_next_agent, AGENT_EDGE_MAP)
     
     workflow.add_edge("synthesize", END)
     